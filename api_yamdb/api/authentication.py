@@ -0,0 +1,182 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import authentication
+from rest_framework_simplejwt import authentication as jwt_authentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from api.cache_backends import shared_cache
+from api.constants import PRINCIPAL_CACHE_TIMEOUT, VERIFIED_TOKEN_CACHE_SIZE
+from api.identity import get_identity_map
+from api.indexes import revoked_tokens
+from api.versioning import bump_version, get_version
+from users.models import RevokedToken, User
+
+PRINCIPAL_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in ('id', 'username', 'role', 'is_superuser',
+                         'is_active')
+)
+PRINCIPAL_KEY_TEMPLATE = 'principal:{}:{}'
+PRINCIPAL_VERSION_CLAIM = 'principal_version'
+
+
+def get_principal_version(user_id):
+    return get_version(f'principal:{user_id}')
+
+
+def invalidate_principal(user_id):
+    bump_version(f'principal:{user_id}')
+
+
+def get_access_token(user):
+    token = AccessToken.for_user(user)
+    if getattr(settings, 'PRINCIPAL_TOKEN_CLAIMS', False):
+        for field in PRINCIPAL_FIELDS:
+            token[field] = getattr(user, field)
+        token[PRINCIPAL_VERSION_CLAIM] = get_principal_version(user.pk)
+    return token
+
+
+def revoke_token(token):
+    RevokedToken.objects.get_or_create(
+        jti=token[api_settings.JTI_CLAIM],
+        defaults={
+            'user_id': token.get(api_settings.USER_ID_CLAIM),
+            'expires_at': datetime_from_epoch(token['exp'])
+        }
+    )
+
+
+def is_revoked(token):
+    jti = token.get(api_settings.JTI_CLAIM)
+    return jti in revoked_tokens and RevokedToken.objects.filter(
+        jti=jti
+    ).exists()
+
+
+class VerifiedTokenCache:
+    """In-process LRU of raw tokens that already passed verification.
+
+    Entries are keyed by a digest of the raw token, so a tampered token
+    never matches, and each one is dropped once the token expires.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.tokens = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(raw_token):
+        return hashlib.blake2b(raw_token, digest_size=16).digest()
+
+    def get(self, raw_token):
+        key = self.make_key(raw_token)
+        with self.lock:
+            entry = self.tokens.get(key)
+            if entry is None:
+                return None
+            token, expires = entry
+            if expires <= time.time():
+                del self.tokens[key]
+                return None
+            self.tokens.move_to_end(key)
+            return token
+
+    def set(self, raw_token, token):
+        key = self.make_key(raw_token)
+        with self.lock:
+            self.tokens[key] = (token, token['exp'])
+            self.tokens.move_to_end(key)
+            if len(self.tokens) > self.max_size:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+
+    def __len__(self):
+        return len(self.tokens)
+
+
+verified_tokens = VerifiedTokenCache(VERIFIED_TOKEN_CACHE_SIZE)
+
+
+class TokenAuthentication(authentication.TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        user, token = super().authenticate_credentials(key)
+        return get_identity_map().add(user), token
+
+
+class CachedJWTAuthentication(jwt_authentication.JWTAuthentication):
+    """Build request.user from a cached principal instead of the user row.
+
+    Verified tokens are remembered, so a reused token is checked once;
+    revocation is screened by a bloom filter on every request.
+    Only the fields that permissions read are loaded; the rest stay
+    deferred. A principal is trusted only while its version matches the
+    user's current one, which every relevant save bumps.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = verified_tokens.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            verified_tokens.set(raw_token, validated_token)
+        if is_revoked(validated_token):
+            raise InvalidToken(_('Token is revoked'))
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        version = get_principal_version(user_id)
+        principal = self.get_claimed_principal(validated_token, version)
+        if principal is None:
+            principal = self.get_cached_principal(user_id, version)
+        user = self.user_model.from_db(
+            DEFAULT_DB_ALIAS, PRINCIPAL_FIELDS, principal
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return get_identity_map().add(user)
+
+    @staticmethod
+    def get_claimed_principal(validated_token, version):
+        if validated_token.get(PRINCIPAL_VERSION_CLAIM) != version:
+            return None
+        try:
+            return tuple(validated_token[field] for field in PRINCIPAL_FIELDS)
+        except KeyError:
+            return None
+
+    def get_cached_principal(self, user_id, version):
+        key = PRINCIPAL_KEY_TEMPLATE.format(user_id, version)
+        principal = shared_cache.get(key)
+        if principal is None:
+            principal = self.user_model.objects.filter(
+                pk=user_id
+            ).values_list(*PRINCIPAL_FIELDS).first()
+            if principal is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found'
+                )
+            shared_cache.set(key, principal, PRINCIPAL_CACHE_TIMEOUT)
+        return principal
@@ -0,0 +1,223 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.test import APIRequestFactory
+
+from reviews.models import Category, Genre, Title
+from reviews.signals import catalog_imported
+from users.models import User
+
+SCENARIOS = {}
+SEED_BATCH_SIZE = 5000
+SEED_WORDS = (
+    'war', 'peace', 'love', 'night', 'city', 'river', 'ghost', 'king',
+    'summer', 'winter', 'storm', 'road', 'house', 'star', 'dream', 'fire',
+    'silent', 'golden', 'broken', 'last', 'secret', 'wild', 'dark', 'lost',
+)
+
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+@contextmanager
+def rollback():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def seed_catalog(size, genres=50, categories=10, genres_per_title=3):
+    Category.objects.bulk_create(
+        Category(name=f'Category {index}', slug=f'category-{index}')
+        for index in range(categories)
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    Genre.objects.bulk_create(
+        Genre(name=f'Genre {index}', slug=f'genre-{index}')
+        for index in range(genres)
+    )
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=' '.join(
+                    (f'Title {index:08d}', *random.sample(SEED_WORDS, 2))
+                ),
+                year=random.randint(1900, 2020),
+                description=' '.join(random.sample(SEED_WORDS, 8)),
+                category_id=random.choice(category_ids)
+            )
+            for index in range(size)
+        ),
+        batch_size=SEED_BATCH_SIZE
+    )
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    through = Title.genre.through
+    through.objects.bulk_create(
+        (
+            through(title_id=title_id, genre_id=genre_id)
+            for title_id in Title.objects.values_list('id', flat=True)
+            for genre_id in random.sample(genre_ids, genres_per_title)
+        ),
+        batch_size=SEED_BATCH_SIZE
+    )
+    catalog_imported.send(sender=seed_catalog)
+
+
+def call_view(view, path, params=None):
+    response = view(APIRequestFactory().get(path, params))
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+@scenario
+def pagination(size, repeat, write):
+    from api.views import TitleViewSet
+
+    view = TitleViewSet.as_view({'get': 'list'}, cache_responses=False)
+    seed_catalog(size)
+    last_page = size // 10
+    for page in (1, last_page // 2, last_page):
+        for mode in ('exact', 'cached', 'estimated', 'none'):
+            cache.clear()
+            params = {'page': page, 'count': mode}
+            timing = measure(
+                lambda: call_view(view, '/api/v1/titles/', params), repeat
+            )
+            write(f'page={page:<8} count={mode:<10} {timing:9.2f} ms')
+
+
+def compare_querysets(factories, repeat, write, label='', explain=False):
+    for name, factory in factories.items():
+        if explain:
+            write(f'{name} plan:\n{factory().explain()}')
+        page = measure(lambda: list(factory()[:10]), repeat)
+        count = measure(lambda: factory().count(), repeat)
+        write(
+            f'{label}{name:<8} page {page:9.2f} ms   count {count:9.2f} ms   '
+            f'rows {factory().count()}'
+        )
+
+
+@scenario
+def genre_filter(size, repeat, write):
+    from api.filters import TitleFilter
+
+    seed_catalog(size)
+    slug = Genre.objects.values_list('slug', flat=True).first()
+    compare_querysets({
+        'join': lambda: Title.objects.filter(
+            genre__slug__icontains=slug
+        ).order_by('name'),
+        'exists': lambda: Title.objects.filter(Exists(
+            Title.genre.through.objects.filter(
+                title=OuterRef('pk'), genre__slug=slug
+            )
+        )).order_by('name'),
+        'bitmap': lambda: TitleFilter(
+            {'genre': slug}, queryset=Title.objects.order_by('name')
+        ).qs,
+    }, repeat, write, explain=True)
+
+
+@scenario
+def multi_genre_filter(size, repeat, write):
+    from api.filters import TitleFilter
+    from api.indexes import title_index
+
+    seed_catalog(size)
+    genres = list(Genre.objects.values_list('slug', flat=True)[:2])
+    category = Category.objects.values_list('slug', flat=True).first()
+    write(f'index build {measure(title_index.refresh, 1):9.2f} ms')
+    for mode in ('any', 'all'):
+        params = {
+            'genre': ','.join(genres),
+            'genre_mode': mode,
+            'category': category
+        }
+        joins = Title.objects.filter(category__slug=category)
+        if mode == 'all':
+            for slug in genres:
+                joins = joins.filter(genre__slug=slug)
+        else:
+            joins = joins.filter(genre__slug__in=genres).distinct()
+        compare_querysets({
+            'join': lambda: joins.order_by('name'),
+            'bitmap': lambda: TitleFilter(
+                params, queryset=Title.objects.order_by('name')
+            ).qs,
+        }, repeat, write, label=f'{mode:<4} ')
+
+
+@scenario
+def search(size, repeat, write):
+    from api.search import title_search_index
+
+    started = time.perf_counter()
+    seed_catalog(size, genres_per_title=1)
+    write(f'seeded {size} titles in {time.perf_counter() - started:.1f} s')
+    for text in ('storm', 'golden king', 'Title 00000042'):
+        compare_querysets({
+            'like': lambda: Title.objects.filter(
+                Q(name__icontains=text) | Q(description__icontains=text)
+            ),
+            'fts': lambda: title_search_index.search(
+                Title.objects.all(), text
+            ),
+        }, repeat, write, label=f'{text!r:<18} ')
+
+
+@scenario
+def autocomplete(size, repeat, write):
+    from api.indexes import title_autocomplete
+
+    seed_catalog(size, genres_per_title=1)
+    write(f'index build {measure(title_autocomplete.refresh, 1):9.2f} ms')
+    write(f'memory footprint {title_autocomplete.memory_footprint():,} bytes')
+    for prefix in ('title 0000004', 'title 00000042', 'title 0'):
+        index = measure(
+            lambda: title_autocomplete.suggest(prefix, 10), repeat
+        )
+        database = measure(lambda: list(Title.objects.filter(
+            name__istartswith=prefix
+        ).order_by('-rating')[:10]), repeat)
+        write(
+            f'{prefix!r:<18} index {index:9.2f} ms   '
+            f'istartswith {database:9.2f} ms'
+        )
+
+
+@scenario
+def token_verification(size, repeat, write):
+    from api.authentication import (CachedJWTAuthentication,
+                                    get_access_token, verified_tokens)
+
+    user = User.objects.create(username='benchmark', email='bench@ya.ru')
+    raw_token = str(get_access_token(user)).encode()
+    authentication = CachedJWTAuthentication()
+    verify = super(CachedJWTAuthentication, authentication)
+    verified_tokens.clear()
+    for name, validate in (
+        ('verify', verify.get_validated_token),
+        ('cached', authentication.get_validated_token),
+    ):
+        timing = measure(
+            lambda: [validate(raw_token) for _ in range(size)], repeat
+        )
+        write(f'{name:<8} {timing * 1000 / size:9.2f} us per request')
@@ -0,0 +1,259 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import stat
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.connection import ConnectionProxy
+
+from api.constants import SHARED_CACHE_ALIAS
+
+MAGIC = b'YAMDBSHM'
+FILE_HEADER = struct.Struct('<8sIII')
+SLOT_HEADER = struct.Struct('<I16sIddI')
+GENERATION = struct.Struct('<I')
+SEQUENCE = struct.Struct('<I')
+DIGEST_OFFSET = SEQUENCE.size
+GENERATION_OFFSET = DIGEST_OFFSET + 16
+SLOTS_OFFSET = FILE_HEADER.size + GENERATION.size
+EMPTY = bytes(16)
+NEVER = float('inf')
+READ_RETRIES = 1000
+
+
+class SharedMemoryCache(BaseCache):
+    """Set-associative cache in a memory-mapped file shared by workers.
+
+    Writers serialize on a file lock and keep a slot's sequence odd while
+    copying; readers take no lock and retry until the sequence is even and
+    unchanged. A full set evicts its oldest slot; clearing bumps the
+    generation, which retires every slot at once. Values are unpickled, so
+    the file is refused unless it is private to the current user.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = location
+        self.slot_size = int(options.get('SLOT_SIZE', 4096))
+        self.ways = int(options.get('WAYS', 4))
+        self.buckets = max(self._max_entries // self.ways, 1)
+        self.capacity = self.slot_size - SLOT_HEADER.size
+        self.header = FILE_HEADER.pack(
+            MAGIC, self.buckets, self.ways, self.slot_size
+        )
+        self.size = SLOTS_OFFSET + (
+            self.buckets * self.ways * self.slot_size
+        )
+        self.lock = threading.RLock()
+        self.pid = None
+
+    @property
+    def region(self):
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.open()
+        return self._region
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path) or '.', 0o700, exist_ok=True)
+        self.fd = os.open(
+            self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600
+        )
+        self.check_ownership()
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            if os.pread(self.fd, FILE_HEADER.size, 0) != self.header or (
+                os.fstat(self.fd).st_size != self.size
+            ):
+                os.ftruncate(self.fd, 0)
+                os.ftruncate(self.fd, self.size)
+                os.pwrite(self.fd, self.header, 0)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self._region = mmap.mmap(self.fd, self.size)
+        self.pid = os.getpid()
+
+    def check_ownership(self):
+        status = os.fstat(self.fd)
+        if not stat.S_ISREG(status.st_mode) or (
+            status.st_uid != os.geteuid()
+            or stat.S_IMODE(status.st_mode) & 0o077
+        ):
+            os.close(self.fd)
+            raise ImproperlyConfigured(
+                f'Shared cache file {self.path} must be a regular file '
+                'owned by this user and not accessible to others.'
+            )
+
+    @contextmanager
+    def writing(self):
+        with self.lock:
+            region = self.region
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                yield region
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def digest(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    def offsets(self, digest):
+        bucket = int.from_bytes(digest[:8], 'little') % self.buckets
+        start = SLOTS_OFFSET + bucket * self.ways * self.slot_size
+        return range(start, start + self.ways * self.slot_size, self.slot_size)
+
+    def read(self, region, offset):
+        current = GENERATION.unpack_from(region, FILE_HEADER.size)[0]
+        for _ in range(READ_RETRIES):
+            sequence, digest, generation, expires, stamp, length = (
+                SLOT_HEADER.unpack_from(region, offset)
+            )
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            start = offset + SLOT_HEADER.size
+            data = region[start:start + min(length, self.capacity)]
+            if SEQUENCE.unpack_from(region, offset)[0] != sequence:
+                continue
+            if generation != current:
+                break
+            return digest, expires, stamp, data
+        return EMPTY, 0.0, 0.0, b''
+
+    def write(self, region, offset, digest, expires, data=b''):
+        sequence = (SEQUENCE.unpack_from(region, offset)[0] + 1) & ~1
+        SEQUENCE.pack_into(region, offset, (sequence + 1) & 0xFFFFFFFF)
+        start = offset + SLOT_HEADER.size
+        region[start:start + len(data)] = data
+        SLOT_HEADER.pack_into(
+            region, offset, (sequence + 1) & 0xFFFFFFFF, digest,
+            GENERATION.unpack_from(region, FILE_HEADER.size)[0], expires,
+            time.time(), len(data)
+        )
+        SEQUENCE.pack_into(region, offset, (sequence + 2) & 0xFFFFFFFF)
+
+    def lookup(self, region, digest):
+        for offset in self.offsets(digest):
+            if region[offset + DIGEST_OFFSET:offset + GENERATION_OFFSET] != (
+                digest
+            ):
+                continue
+            slot_digest, expires, _, data = self.read(region, offset)
+            if slot_digest != digest:
+                continue
+            if expires <= time.time():
+                return offset, None
+            return offset, data
+        return None, None
+
+    def choose(self, region, digest):
+        now = time.time()
+        victim, oldest = None, NEVER
+        for offset in self.offsets(digest):
+            slot_digest, expires, stamp, _ = self.read(region, offset)
+            if slot_digest == digest or slot_digest == EMPTY or (
+                expires <= now
+            ):
+                return offset
+            if stamp < oldest:
+                victim, oldest = offset, stamp
+        return victim
+
+    def get_expiry(self, timeout):
+        expiry = self.get_backend_timeout(timeout)
+        return NEVER if expiry is None else expiry
+
+    def store(self, region, digest, value, timeout):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.capacity:
+            offset, _ = self.lookup(region, digest)
+            if offset is not None:
+                self.write(region, offset, EMPTY, 0.0)
+            return False
+        self.write(
+            region, self.choose(region, digest), digest,
+            self.get_expiry(timeout), data
+        )
+        return True
+
+    def get(self, key, default=None, version=None):
+        _, data = self.lookup(self.region, self.digest(key, version))
+        if data is None:
+            return default
+        return pickle.loads(data)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        digest = self.digest(key, version)
+        with self.writing() as region:
+            self.store(region, digest, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        digest = self.digest(key, version)
+        with self.writing() as region:
+            if self.lookup(region, digest)[1] is not None:
+                return False
+            return self.store(region, digest, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        digest = self.digest(key, version)
+        with self.writing() as region:
+            offset, data = self.lookup(region, digest)
+            if data is None:
+                return False
+            self.write(region, offset, digest, self.get_expiry(timeout), data)
+            return True
+
+    def incr(self, key, delta=1, version=None):
+        digest = self.digest(key, version)
+        with self.writing() as region:
+            offset, data = self.lookup(region, digest)
+            if data is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(data) + delta
+            expires = self.read(region, offset)[1]
+            self.write(
+                region, offset, digest, expires,
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            )
+            return value
+
+    def delete(self, key, version=None):
+        digest = self.digest(key, version)
+        with self.writing() as region:
+            offset, data = self.lookup(region, digest)
+            if offset is None:
+                return False
+            self.write(region, offset, EMPTY, 0.0)
+            return data is not None
+
+    def clear(self):
+        with self.writing() as region:
+            generation = GENERATION.unpack_from(region, FILE_HEADER.size)[0]
+            GENERATION.pack_into(
+                region, FILE_HEADER.size, (generation + 1) & 0xFFFFFFFF
+            )
+
+    def __len__(self):
+        now = time.time()
+        region = self.region
+        count = 0
+        for offset in range(SLOTS_OFFSET, self.size, self.slot_size):
+            digest, expires, _, _ = self.read(region, offset)
+            count += digest != EMPTY and expires > now
+        return count
+
+
+shared_cache = ConnectionProxy(caches, SHARED_CACHE_ALIAS)
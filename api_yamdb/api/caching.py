@@ -0,0 +1,187 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from api.cache_backends import shared_cache
+from api.constants import (
+    FLIGHT_TIMEOUT,
+    FRAGMENT_CACHE_TIMEOUT,
+    RESPONSE_CACHE_TIMEOUT
+)
+from api.metrics import Counter
+from api.versioning import VERSION_KEY_TEMPLATE, bump_version
+
+TAG_VERSION_TEMPLATE = 'tag:{}'
+RESPONSE_KEY_TEMPLATE = 'response:{}'
+FRAGMENT_KEY_TEMPLATE = 'fragment:{}:{}:{}'
+ANONYMOUS = 'anonymous'
+
+
+class ResponseCache:
+
+    def __init__(self, timeout=RESPONSE_CACHE_TIMEOUT):
+        self.timeout = timeout
+        self.hits = Counter('response_cache.hits')
+        self.misses = Counter('response_cache.misses')
+
+    @staticmethod
+    def is_cacheable(request):
+        return (
+            request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+        )
+
+    @staticmethod
+    def make_key(request, auth=ANONYMOUS):
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        digest = hashlib.md5(repr((
+            request.path,
+            query,
+            auth,
+            request.META.get('HTTP_ACCEPT', '')
+        )).encode()).hexdigest()
+        return RESPONSE_KEY_TEMPLATE.format(digest)
+
+    @staticmethod
+    def get_tag_versions(tags):
+        keys = {
+            VERSION_KEY_TEMPLATE.format(TAG_VERSION_TEMPLATE.format(tag)): tag
+            for tag in tags
+        }
+        versions = shared_cache.get_many(keys)
+        for key in keys.keys() - versions.keys():
+            shared_cache.add(key, time.time_ns(), None)
+            versions[key] = shared_cache.get(key)
+        return {keys[key]: version for key, version in versions.items()}
+
+    def lookup(self, request, tag_versions, check_last_modified=False,
+               stale=False, state='HIT'):
+        entry = cache.get(self.make_key(request))
+        if entry is None or (not stale and entry['tags'] != tag_versions):
+            return None
+        response = HttpResponse(entry['content'], status=entry['status'])
+        for header, value in entry['headers']:
+            response[header] = value
+        response['X-Cache'] = state
+        last_modified = response.get('Last-Modified')
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=(
+                parse_http_date_safe(last_modified)
+                if check_last_modified and last_modified else None
+            ),
+            response=response
+        )
+
+    def get(self, request, tag_versions, check_last_modified=False):
+        response = self.lookup(request, tag_versions, check_last_modified)
+        if response is None:
+            self.misses.increment()
+        else:
+            self.hits.increment()
+        return response
+
+    def set(self, request, response, tag_versions):
+        response['X-Cache'] = 'MISS'
+        if response.status_code != 200:
+            return
+        cache.set(self.make_key(request), {
+            'tags': tag_versions,
+            'status': response.status_code,
+            'content': response.content,
+            'headers': [
+                item for item in response.items() if item[0] != 'X-Cache'
+            ],
+        }, self.timeout)
+
+    @staticmethod
+    def invalidate(*tags):
+        for tag in tags:
+            bump_version(TAG_VERSION_TEMPLATE.format(tag))
+
+
+class FragmentCache:
+
+    def __init__(self, timeout=FRAGMENT_CACHE_TIMEOUT):
+        self.timeout = timeout
+        self.hits = Counter('fragment_cache.hits')
+        self.misses = Counter('fragment_cache.misses')
+
+    def render_many(self, name, objects, render, get_version):
+        keys = [
+            FRAGMENT_KEY_TEMPLATE.format(name, obj.pk, get_version(obj))
+            for obj in objects
+        ]
+        fragments = shared_cache.get_many(keys)
+        missing = [
+            (key, obj) for key, obj in zip(keys, objects)
+            if key not in fragments
+        ]
+        rendered = dict(zip(
+            [key for key, _ in missing],
+            render([obj for _, obj in missing]) if missing else ()
+        ))
+        if rendered:
+            shared_cache.set_many(rendered, self.timeout)
+            self.misses.increment(len(rendered))
+        if fragments:
+            self.hits.increment(len(fragments))
+        fragments.update(rendered)
+        return [fragments[key] for key in keys]
+
+
+class Flight:
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class SingleFlight:
+
+    def __init__(self, timeout=FLIGHT_TIMEOUT):
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.leaders = Counter('single_flight.leaders')
+        self.coalesced = Counter('single_flight.coalesced')
+        self.stale = Counter('single_flight.stale')
+        self.fallbacks = Counter('single_flight.fallbacks')
+
+    def run(self, key, compute, retry, stale=None):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+        if leader:
+            self.leaders.increment()
+            try:
+                return compute()
+            finally:
+                with self.lock:
+                    del self.flights[key]
+                flight.done.set()
+        if stale is not None:
+            result = stale()
+            if result is not None:
+                self.stale.increment()
+                return result
+        flight.done.wait(self.timeout)
+        result = retry()
+        if result is not None:
+            self.coalesced.increment()
+            return result
+        self.fallbacks.increment()
+        return compute()
+
+
+response_cache = ResponseCache()
+fragment_cache = FragmentCache()
+single_flight = SingleFlight()
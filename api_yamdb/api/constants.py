@@ -1,5 +1,21 @@
 API_VERSION: str = 'v1/'
+AUTOCOMPLETE_LIMIT: int = 10
+AUTOCOMPLETE_MAX_LIMIT: int = 50
+AUTOCOMPLETE_OVERLAP: int = 60
+COUNT_CACHE_TIMEOUT: int = 60
+FLIGHT_TIMEOUT: int = 5
+FRAGMENT_CACHE_TIMEOUT: int = 3600
+LIVE_IDS_OVERLAP: int = 1000
 MAX_SCORE_VALUE: int = 10
 MIN_SCORE_VALUE: int = 1
+PRINCIPAL_CACHE_TIMEOUT: int = 3600
+REMOVAL_LOG_LENGTH: int = 256
+REMOVAL_LOG_TIMEOUT: int = 3600
+RESPONSE_CACHE_TIMEOUT: int = 300
+REVOCATION_FILTER_BITS: int = 1 << 20
+REVOCATION_FILTER_HASHES: int = 7
+REVOCATION_FILTER_OVERLAP: int = 1000
+SHARED_CACHE_ALIAS: str = 'shared'
 TEXT_FIELD_LENGTH: int = 255
 USERNAME_LENGTH: int = 150
+VERIFIED_TOKEN_CACHE_SIZE: int = 4096
@@ -1,17 +1,72 @@
 from django_filters import rest_framework as filters
-from reviews.models import Title
+from rest_framework.filters import BaseFilterBackend
+
+from api.indexes import filter_by_ids, title_index
+from reviews.models import Comment, Review, Title
+
+GENRE_MODES = (
+    ('any', 'Any of the genres'),
+    ('all', 'All of the genres'),
+)
+
+
+class SlugInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    category = SlugInFilter(method='filter_by_index')
+    genre = SlugInFilter(method='filter_by_index')
+    genre_mode = filters.ChoiceFilter(
+        choices=GENRE_MODES,
+        method='filter_by_index'
     )
 
     class Meta:
         model = Title
         fields = '__all__'
+
+    def filter_by_index(self, queryset, name, value):
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        genres = self.form.cleaned_data.get('genre')
+        categories = self.form.cleaned_data.get('category')
+        if not genres and not categories:
+            return queryset
+        return filter_by_ids(queryset, title_index.search(
+            genres=genres,
+            categories=categories,
+            match_all=self.form.cleaned_data.get('genre_mode') == 'all'
+        ))
+
+
+class ReviewSearchFilter(filters.FilterSet):
+    title = filters.NumberFilter(field_name='title')
+    author = filters.CharFilter(field_name='author__username')
+    since = filters.IsoDateTimeFilter(field_name='pub_date', lookup_expr='gte')
+    until = filters.IsoDateTimeFilter(field_name='pub_date', lookup_expr='lte')
+
+    class Meta:
+        model = Review
+        fields = ('title', 'author', 'since', 'until')
+
+
+class CommentSearchFilter(ReviewSearchFilter):
+    title = filters.NumberFilter(field_name='review__title')
+    review = filters.NumberFilter(field_name='review')
+
+    class Meta:
+        model = Comment
+        fields = ('title', 'review', 'author', 'since', 'until')
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param)
+        if not text:
+            return queryset
+        return view.search_index.search(queryset, text)
@@ -0,0 +1,52 @@
+from contextvars import ContextVar
+
+_identity_map = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+
+    def __init__(self):
+        self.objects = {}
+        self.saved = 0
+
+    @staticmethod
+    def make_key(model, pk):
+        return model._meta.concrete_model._meta.label_lower, str(pk)
+
+    def add(self, obj):
+        return self.objects.setdefault(self.make_key(type(obj), obj.pk), obj)
+
+    def fetch(self, queryset, pk, **filters):
+        obj = self.objects.get(self.make_key(queryset.model, pk))
+        if obj is not None and all(
+            str(getattr(obj, field)) == str(value)
+            for field, value in filters.items()
+        ):
+            self.saved += 1
+            return obj
+        return self.add(queryset.get(pk=pk, **filters))
+
+    def attach(self, obj, field_name):
+        field = obj._meta.get_field(field_name)
+        if field.is_cached(obj):
+            return obj
+        related = self.objects.get(
+            self.make_key(field.related_model, getattr(obj, field.attname))
+        )
+        if related is not None:
+            field.set_cached_value(obj, related)
+            self.saved += 1
+        return obj
+
+
+def get_identity_map():
+    identity_map = _identity_map.get()
+    return IdentityMap() if identity_map is None else identity_map
+
+
+def activate(identity_map):
+    return _identity_map.set(identity_map)
+
+
+def deactivate(token):
+    _identity_map.reset(token)
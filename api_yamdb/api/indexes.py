@@ -0,0 +1,470 @@
+import hashlib
+import heapq
+import json
+import sys
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from api.constants import (AUTOCOMPLETE_OVERLAP, LIVE_IDS_OVERLAP,
+                           REVOCATION_FILTER_BITS, REVOCATION_FILTER_HASHES,
+                           REVOCATION_FILTER_OVERLAP)
+from api.versioning import RemovalLog, VersionedIndex
+from reviews.models import Category, Genre, Review, Title
+from users.models import RevokedToken
+
+
+def make_bitmap(ids):
+    ids = list(ids)
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for item in ids:
+        data[item >> 3] |= 1 << (item & 7)
+    return int.from_bytes(data, 'little')
+
+
+def iter_bitmap(bitmap):
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for index, byte in enumerate(data):
+        while byte:
+            lowest = byte & -byte
+            yield (index << 3) + lowest.bit_length() - 1
+            byte ^= lowest
+
+
+def filter_by_ids(queryset, ids):
+    if connections[queryset.db].vendor == 'sqlite':
+        return queryset.filter(pk__in=RawSQL(
+            'SELECT value FROM json_each(%s)', (json.dumps(ids),)
+        ))
+    return queryset.filter(pk__in=ids)
+
+
+class TitleBitmapIndex(VersionedIndex):
+    version_name = 'title-bitmap-index'
+
+    def __init__(self):
+        super().__init__()
+        self.genres = {}
+        self.categories = {}
+        self.genre_slugs = {}
+        self.category_slugs = {}
+
+    def build(self):
+        self.genre_slugs = dict(Genre.objects.values_list('id', 'slug'))
+        self.category_slugs = dict(Category.objects.values_list('id', 'slug'))
+        genres = defaultdict(list)
+        for title_id, genre_id in Title.genre.through.objects.values_list(
+            'title_id', 'genre_id'
+        ).iterator():
+            genres[self.genre_slugs[genre_id]].append(title_id)
+        categories = defaultdict(list)
+        for title_id, category_id in Title.objects.filter(
+            category__isnull=False
+        ).values_list('id', 'category_id').iterator():
+            categories[self.category_slugs[category_id]].append(title_id)
+        self.genres = {
+            slug: make_bitmap(ids) for slug, ids in genres.items()
+        }
+        self.categories = {
+            slug: make_bitmap(ids) for slug, ids in categories.items()
+        }
+
+    def search(self, genres=(), categories=(), match_all=False):
+        self.refresh()
+        with self.lock:
+            bitmap = None
+            if genres:
+                bitmaps = [self.genres.get(slug, 0) for slug in genres]
+                bitmap = bitmaps[0]
+                for other in bitmaps[1:]:
+                    bitmap = bitmap & other if match_all else bitmap | other
+            if categories:
+                category_bitmap = 0
+                for slug in categories:
+                    category_bitmap |= self.categories.get(slug, 0)
+                bitmap = (
+                    category_bitmap if bitmap is None
+                    else bitmap & category_bitmap
+                )
+        return list(iter_bitmap(bitmap or 0))
+
+    def set_category(self, title_id, category_id):
+        def change():
+            self.discard(self.categories, title_id)
+            if category_id is not None:
+                self.add(
+                    self.categories, self.category_slugs[category_id], title_id
+                )
+        self.apply(change)
+
+    def add_genres(self, title_id, genre_ids):
+        def change():
+            for genre_id in genre_ids:
+                self.add(self.genres, self.genre_slugs[genre_id], title_id)
+        self.apply(change)
+
+    def remove_genres(self, title_id, genre_ids=None):
+        def change():
+            if genre_ids is None:
+                self.discard(self.genres, title_id)
+                return
+            for genre_id in genre_ids:
+                slug = self.genre_slugs[genre_id]
+                self.genres[slug] = self.genres.get(slug, 0) & ~(1 << title_id)
+        self.apply(change)
+
+    def remove_title(self, title_id):
+        def change():
+            self.discard(self.genres, title_id)
+            self.discard(self.categories, title_id)
+        self.apply(change)
+
+    @staticmethod
+    def add(bitmaps, slug, title_id):
+        bitmaps[slug] = bitmaps.get(slug, 0) | (1 << title_id)
+
+    @staticmethod
+    def discard(bitmaps, title_id):
+        mask = ~(1 << title_id)
+        for slug, bitmap in bitmaps.items():
+            if bitmap >> title_id & 1:
+                bitmaps[slug] = bitmap & mask
+
+
+def normalize_name(name):
+    return ' '.join(name.casefold().replace('ё', 'е').split())
+
+
+class TitleAutocompleteIndex(VersionedIndex):
+    """Title names sorted for prefix lookups.
+
+    Other workers catch up by reloading titles modified since their last
+    load, less an overlap for late commits, and replaying removals from a
+    short log in the shared cache.
+    """
+    version_name = 'title-autocomplete-index'
+
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+        self.titles = {}
+        self.removal_log = RemovalLog(f'{self.version_name}:removals')
+        self.removals = None
+        self.loaded_at = None
+
+    def build(self):
+        self.removals = self.removal_log.position()
+        self.loaded_at = timezone.now()
+        self.titles = {
+            title_id: (normalize_name(name), name, rating)
+            for title_id, name, rating in Title.objects.values_list(
+                'id', 'name', 'rating'
+            ).iterator()
+        }
+        self.keys = sorted(
+            (key, title_id) for title_id, (key, _, _) in self.titles.items()
+        )
+
+    def catch_up(self):
+        removals = self.removal_log.position()
+        removed = self.removal_log.read(self.removals, removals)
+        if removed is None:
+            return False
+        loaded_at = timezone.now()
+        for title_id, name, rating in Title.objects.filter(
+            updated_at__gte=self.loaded_at - timedelta(
+                seconds=AUTOCOMPLETE_OVERLAP
+            )
+        ).values_list('id', 'name', 'rating').iterator():
+            self.put(title_id, name, rating)
+        for title_id in removed:
+            self.discard(title_id)
+        self.removals = removals
+        self.loaded_at = loaded_at
+        return True
+
+    def suggest(self, prefix, limit):
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        self.refresh()
+        with self.lock:
+            start = bisect_left(self.keys, (prefix,))
+            stop = bisect_left(self.keys, (prefix + chr(sys.maxunicode),))
+            title_ids = [title_id for _, title_id in self.keys[start:stop]]
+            best = heapq.nsmallest(
+                limit,
+                title_ids,
+                key=lambda title_id: (
+                    -(self.titles[title_id][2] or 0),
+                    self.titles[title_id][0]
+                )
+            )
+            return [
+                {
+                    'id': title_id,
+                    'name': self.titles[title_id][1],
+                    'rating': self.titles[title_id][2]
+                }
+                for title_id in best
+            ]
+
+    def upsert(self, title_id, name, rating):
+        self.apply(lambda: self.put(title_id, name, rating))
+
+    def put(self, title_id, name, rating):
+        self.discard(title_id)
+        key = normalize_name(name)
+        self.titles[title_id] = (key, name, rating)
+        insort(self.keys, (key, title_id))
+
+    def set_rating(self, title_id):
+        rating = Title.objects.filter(pk=title_id).values_list(
+            'rating', flat=True
+        ).first()
+
+        def change():
+            key, name, _ = self.titles[title_id]
+            self.titles[title_id] = (key, name, rating)
+        self.apply(change)
+
+    def remove(self, title_id):
+        number = self.removal_log.record(title_id)
+
+        def change():
+            self.discard(title_id)
+            if number == self.removals + 1:
+                self.removals = number
+        self.apply(change)
+
+    def discard(self, title_id):
+        if title_id not in self.titles:
+            return
+        key = self.titles.pop(title_id)[0]
+        del self.keys[bisect_left(self.keys, (key, title_id))]
+
+    def memory_footprint(self):
+        with self.lock:
+            size = sys.getsizeof(self.keys) + sys.getsizeof(self.titles)
+            for key in self.keys:
+                size += sys.getsizeof(key)
+            for title_id, entry in self.titles.items():
+                size += sys.getsizeof(title_id) + sys.getsizeof(entry)
+                size += sum(sys.getsizeof(value) for value in entry)
+            return size
+
+
+class ReferenceSnapshot(VersionedIndex):
+    version_name = 'reference-snapshot'
+    models = (Category, Genre)
+
+    def __init__(self):
+        super().__init__()
+        self.tables = {}
+        self.slugs = {}
+
+    def build(self):
+        self.tables = {
+            model: {
+                row[0]: row[1:]
+                for row in model.objects.values_list('id', 'name', 'slug')
+            }
+            for model in self.models
+        }
+        self.slugs = {
+            model: {slug: pk for pk, (_, slug) in rows.items()}
+            for model, rows in self.tables.items()
+        }
+
+    def rows(self, model):
+        self.refresh()
+        with self.lock:
+            return sorted(
+                (name, pk, slug)
+                for pk, (name, slug) in self.tables[model].items()
+            )
+
+    def describe(self, model, pk):
+        self.refresh()
+        with self.lock:
+            row = self.tables[model].get(pk)
+        if row is None:
+            row = model.objects.filter(pk=pk).values_list(
+                'name', 'slug'
+            ).first()
+        return None if row is None else {'name': row[0], 'slug': row[1]}
+
+    def resolve(self, model, slug, using):
+        self.refresh()
+        with self.lock:
+            pk = self.slugs[model].get(slug)
+            if pk is None:
+                return None
+            name = self.tables[model][pk][0]
+        return model.from_db(using, ('id', 'name', 'slug'), (pk, name, slug))
+
+    def upsert(self, model, pk, name, slug):
+        def change():
+            self.discard(model, pk)
+            self.tables[model][pk] = (name, slug)
+            self.slugs[model][slug] = pk
+        self.apply(change)
+
+    def remove(self, model, pk):
+        self.apply(lambda: self.discard(model, pk))
+
+    def discard(self, model, pk):
+        row = self.tables[model].pop(pk, None)
+        if row is not None:
+            del self.slugs[model][row[1]]
+
+
+class LiveIdSet(VersionedIndex):
+    """Bitmap of existing primary keys.
+
+    Other workers catch up by loading rows above the last id they saw and
+    replaying removals from a short log in the shared cache; a gap in the
+    log falls back to a full rebuild.
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        self.version_name = f'live-ids:{model._meta.label_lower}'
+        self.removal_log = RemovalLog(f'{self.version_name}:removals')
+        self.bits = bytearray()
+        self.last_pk = 0
+        self.removals = None
+
+    def build(self):
+        self.bits = bytearray()
+        self.last_pk = 0
+        self.removals = self.removal_log.position()
+        self.load(self.model.objects.all())
+
+    def load(self, queryset):
+        for pk in queryset.order_by().values_list('id', flat=True):
+            self.set_bit(pk)
+            self.last_pk = max(self.last_pk, pk)
+
+    def catch_up(self):
+        removals = self.removal_log.position()
+        removed = self.removal_log.read(self.removals, removals)
+        if removed is None:
+            return False
+        self.load(self.model.objects.filter(
+            pk__gt=self.last_pk - LIVE_IDS_OVERLAP
+        ))
+        for pk in removed:
+            self.clear_bit(pk)
+        self.removals = removals
+        return True
+
+    def set_bit(self, pk):
+        index = pk >> 3
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index - len(self.bits) + 1))
+        self.bits[index] |= 1 << (pk & 7)
+
+    def clear_bit(self, pk):
+        index = pk >> 3
+        if index < len(self.bits):
+            self.bits[index] &= ~(1 << (pk & 7)) & 0xFF
+
+    def __contains__(self, pk):
+        self.refresh()
+        with self.lock:
+            index = pk >> 3
+            return index < len(self.bits) and bool(
+                self.bits[index] >> (pk & 7) & 1
+            )
+
+    def add(self, pk):
+        def change():
+            self.set_bit(pk)
+            self.last_pk = max(self.last_pk, pk)
+        self.apply(change)
+
+    def remove(self, pk):
+        number = self.removal_log.record(pk)
+
+        def change():
+            self.clear_bit(pk)
+            if number == self.removals + 1:
+                self.removals = number
+        self.apply(change)
+
+
+class RevokedTokenFilter(VersionedIndex):
+    """Bloom filter of revoked token ids.
+
+    A miss proves a token was never revoked; a hit still has to be
+    confirmed against the table. Revocations are append-only, so other
+    workers catch up by loading only recent rows; the overlap covers ids
+    that commit out of order.
+    """
+    version_name = 'revoked-tokens'
+
+    def __init__(self, size=REVOCATION_FILTER_BITS,
+                 hashes=REVOCATION_FILTER_HASHES):
+        super().__init__()
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(size // 8)
+        self.last_pk = 0
+
+    def build(self):
+        self.bits = bytearray(self.size // 8)
+        self.last_pk = 0
+        self.load()
+
+    def load(self):
+        for pk, jti in RevokedToken.objects.filter(
+            pk__gt=self.last_pk - REVOCATION_FILTER_OVERLAP
+        ).order_by('pk').values_list('pk', 'jti'):
+            self.set_bits(jti)
+            self.last_pk = pk
+
+    def catch_up(self):
+        self.load()
+        return True
+
+    def positions(self, jti):
+        digest = hashlib.blake2b(str(jti).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return (
+            (first + index * second) % self.size
+            for index in range(self.hashes)
+        )
+
+    def set_bits(self, jti):
+        for position in self.positions(jti):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, jti):
+        self.refresh()
+        with self.lock:
+            return all(
+                self.bits[position >> 3] >> (position & 7) & 1
+                for position in self.positions(jti)
+            )
+
+    def add(self, pk, jti):
+        def change():
+            self.set_bits(jti)
+            self.last_pk = max(self.last_pk, pk)
+        self.apply(change)
+
+
+title_index = TitleBitmapIndex()
+title_autocomplete = TitleAutocompleteIndex()
+reference_snapshot = ReferenceSnapshot()
+live_ids = {model: LiveIdSet(model) for model in (Title, Review)}
+revoked_tokens = RevokedTokenFilter()
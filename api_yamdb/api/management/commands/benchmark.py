@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks import SCENARIOS, rollback
+
+
+class Command(BaseCommand):
+    help = 'Run a benchmark scenario on throwaway data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(SCENARIOS))
+        parser.add_argument('--size', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options['size'] < 1 or options['repeat'] < 1:
+            raise CommandError('--size and --repeat must be positive')
+        with rollback():
+            SCENARIOS[options['scenario']](
+                options['size'], options['repeat'], self.stdout.write
+            )
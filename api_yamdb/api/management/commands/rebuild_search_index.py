@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from api.search import SEARCH_INDEXES
+
+
+class Command(BaseCommand):
+    help = 'Create and rebuild full-text search indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'indexes',
+            nargs='*',
+            help=f'Any of: {", ".join(sorted(SEARCH_INDEXES))}'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        unknown = set(options['indexes']) - set(SEARCH_INDEXES)
+        if unknown:
+            raise CommandError(
+                f'Unknown indexes: {", ".join(sorted(unknown))}'
+            )
+        for name in options['indexes'] or sorted(SEARCH_INDEXES):
+            index = SEARCH_INDEXES[name]
+            if not index.is_supported(using):
+                self.stdout.write(
+                    f'Skipping {name}: full-text search needs SQLite FTS5'
+                )
+                continue
+            index.install(using)
+            index.rebuild(using)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {name} index'))
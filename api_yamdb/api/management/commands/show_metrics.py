@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.metrics import Counter, get_metrics
+
+
+class Command(BaseCommand):
+    help = 'Print the API counters, optionally resetting them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true')
+
+    def handle(self, *args, **options):
+        for name, value in get_metrics().items():
+            self.stdout.write(f'{name}: {value}')
+        if options['reset']:
+            for counter in Counter.registry.values():
+                counter.reset()
@@ -0,0 +1,36 @@
+from api.cache_backends import shared_cache
+
+METRIC_KEY_TEMPLATE = 'metric:{}'
+
+
+class Counter:
+    registry = {}
+
+    def __init__(self, name):
+        self.name = name
+        self.key = METRIC_KEY_TEMPLATE.format(name)
+        Counter.registry[name] = self
+
+    def increment(self, delta=1):
+        try:
+            return shared_cache.incr(self.key, delta)
+        except ValueError:
+            shared_cache.add(self.key, 0, None)
+            return shared_cache.incr(self.key, delta)
+
+    @property
+    def value(self):
+        return shared_cache.get(self.key, 0)
+
+    def reset(self):
+        shared_cache.delete(self.key)
+
+
+def get_metrics():
+    values = shared_cache.get_many(
+        [counter.key for counter in Counter.registry.values()]
+    )
+    return {
+        name: values.get(counter.key, 0)
+        for name, counter in sorted(Counter.registry.items())
+    }
@@ -0,0 +1,22 @@
+from django.conf import settings
+
+from api.identity import IdentityMap, activate, deactivate
+
+IDENTITY_MAP_HEADER = 'X-Identity-Map-Saved'
+
+
+class IdentityMapMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        identity_map = IdentityMap()
+        token = activate(identity_map)
+        try:
+            response = self.get_response(request)
+        finally:
+            deactivate(token)
+        if settings.DEBUG:
+            response[IDENTITY_MAP_HEADER] = str(identity_map.saved)
+        return response
@@ -1,15 +1,157 @@
-from django.shortcuts import get_object_or_404
-from rest_framework import mixins, viewsets
+import hashlib
+from datetime import datetime
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import mixins, status, viewsets
 from rest_framework.filters import SearchFilter
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from api.caching import response_cache, single_flight
+from api.identity import get_identity_map
+from api.indexes import live_ids, reference_snapshot
+from api.metrics import Counter
+from api.pagination import KeysetPagination
+from api.permissions import (IsAdminOrReadOnly, IsStaffOrAuthorOrReadOnly,
+                             get_principal)
 
-from api.permissions import IsStaffOrAuthorOrReadOnly, IsAdminOrReadOnly
+negative_lookups = Counter('negative_lookups.short_circuits')
 
 
 class PutNotAllowedMixin():
     http_method_names = ['get', 'head', 'post', 'delete', 'patch', 'options']
 
 
+class EagerLoadingMixin():
+
+    def apply_eager_loading(self, queryset):
+        serializer_class = self.get_serializer_class()
+        return queryset.select_related(
+            *getattr(serializer_class, 'select_related_fields', ())
+        ).prefetch_related(
+            *getattr(serializer_class, 'prefetch_related_fields', ())
+        )
+
+    def get_queryset(self):
+        return self.apply_eager_loading(super().get_queryset())
+
+
+class ResponseCacheMixin():
+    cache_tag = None
+    cache_dependencies = ()
+    coalesce_misses = False
+    cache_responses = True
+
+    def get_cache_tags(self, lookup):
+        return (
+            f'{self.cache_tag}:{"*" if lookup is None else lookup}',
+            *(f'{tag}:*' for tag in self.cache_dependencies)
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.cache_responses or not response_cache.is_cacheable(
+            request
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        tag_versions = response_cache.get_tag_versions(
+            self.get_cache_tags(lookup)
+        )
+        check_last_modified = lookup is not None
+        response = response_cache.get(
+            request, tag_versions, check_last_modified
+        )
+        if response is not None:
+            return response
+        compute = partial(
+            self.dispatch_and_cache, request, tag_versions, *args, **kwargs
+        )
+        if not self.coalesce_misses:
+            return compute()
+        return single_flight.run(
+            response_cache.make_key(request),
+            compute,
+            retry=partial(
+                response_cache.lookup, request, tag_versions,
+                check_last_modified, state='COALESCED'
+            ),
+            stale=partial(
+                response_cache.lookup, request, tag_versions,
+                check_last_modified, stale=True, state='STALE'
+            )
+        )
+
+    def dispatch_and_cache(self, request, tag_versions, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        response_cache.set(request, response, tag_versions)
+        return response
+
+
+class ConditionalGetMixin():
+
+    def get_etag(self, request, versions):
+        digest = hashlib.sha1(repr((
+            request.get_full_path(),
+            request.accepted_media_type,
+            versions
+        )).encode()).hexdigest()
+        return f'"{digest}"'
+
+    def respond_conditionally(self, request, render, versions,
+                              check_last_modified=True):
+        etag = self.get_etag(request, versions)
+        dates = [
+            version for version in versions if isinstance(version, datetime)
+        ]
+        timestamp = int(max(dates).timestamp()) if dates else None
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=timestamp if check_last_modified else None
+        )
+        if response is None:
+            response = render()
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def get_list_tags(self):
+        return ()
+
+    def list(self, request, *args, **kwargs):
+        versions = response_cache.get_tag_versions(self.get_list_tags())
+        return self.respond_conditionally(
+            request,
+            partial(super().list, request, *args, **kwargs),
+            tuple(sorted(versions.items())),
+            check_last_modified=False
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        render = partial(super().retrieve, request, *args, **kwargs)
+        try:
+            last_modified = self.filter_queryset(self.get_queryset()).filter(
+                pk=kwargs[self.lookup_url_kwarg or self.lookup_field]
+            ).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if last_modified is None:
+            return render()
+        return self.respond_conditionally(request, render, (last_modified,))
+
+
 class CategoryGenreMixin(
+    ResponseCacheMixin,
     PutNotAllowedMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -21,12 +163,138 @@ class CategoryGenreMixin(
     search_fields = ('name', )
     lookup_field = 'slug'
 
+    def list(self, request, *args, **kwargs):
+        terms = [
+            term.casefold()
+            for term in self.filter_backends[0]().get_search_terms(request)
+        ]
+        rows = [
+            {'name': name, 'slug': slug}
+            for name, _, slug in reference_snapshot.rows(
+                self.get_queryset().model
+            )
+            if all(term in name.casefold() for term in terms)
+        ]
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows)
+
 
-class ReviewCommentMixin(PutNotAllowedMixin, viewsets.ModelViewSet):
+class ReviewCommentMixin(
+    PutNotAllowedMixin,
+    EagerLoadingMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet
+):
     permission_classes = (IsStaffOrAuthorOrReadOnly,)
+    pagination_class = KeysetPagination
+    cursor_ordering = ('pub_date', 'id')
+    parent_model = None
+    parent_lookups = ()
+    list_tag = None
 
     @staticmethod
-    def get_db_object(db_object_model, object_id, title=None):
-        if title:
-            get_object_or_404(db_object_model, id=object_id, title=title)
-        return get_object_or_404(db_object_model, id=object_id)
+    def ensure_live(db_object_model, object_id):
+        if int(object_id) not in live_ids[db_object_model]:
+            negative_lookups.increment()
+            raise Http404(
+                f'No {db_object_model._meta.object_name} matches the given '
+                'query.'
+            )
+
+    def get_parent(self):
+        resolved = getattr(self.request, 'resolved_parents', None)
+        if resolved is None:
+            resolved = self.request.resolved_parents = {}
+        key = (self.parent_model, *(
+            self.kwargs[kwarg] for _, kwarg, _ in self.parent_lookups
+        ))
+        if key not in resolved:
+            for model, kwarg, _ in self.parent_lookups:
+                self.ensure_live(model, self.kwargs[kwarg])
+            filters = {
+                field: self.kwargs[kwarg]
+                for _, kwarg, field in self.parent_lookups
+            }
+            try:
+                resolved[key] = get_identity_map().fetch(
+                    self.parent_model.objects.all(),
+                    filters.pop('pk'),
+                    **filters
+                )
+            except self.parent_model.DoesNotExist:
+                raise Http404(
+                    f'No {self.parent_model._meta.object_name} matches the '
+                    'given query.'
+                )
+        return resolved[key]
+
+    def apply_eager_loading(self, queryset):
+        if self.request.method in SAFE_METHODS:
+            return super().apply_eager_loading(queryset)
+        return queryset
+
+    def check_object_permissions(self, request, obj):
+        identity_map = get_identity_map()
+        identity_map.attach(identity_map.add(obj), 'author')
+        super().check_object_permissions(request, obj)
+
+    def get_write_queryset(self):
+        for model, kwarg, _ in self.parent_lookups:
+            self.ensure_live(model, self.kwargs[kwarg])
+        parent = self.parent_model._meta.model_name
+        queryset = self.get_serializer_class().Meta.model.objects.filter(
+            pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field],
+            **{
+                f'{parent}__{field}': self.kwargs[kwarg]
+                for _, kwarg, field in self.parent_lookups
+            }
+        )
+        principal = get_principal(self.request)
+        if principal.is_admin or principal.is_moderator:
+            return queryset
+        return queryset.filter(author_id=principal.id)
+
+    def write_failed(self):
+        self.get_object()
+        raise Http404(
+            f'No {self.get_serializer_class().Meta.model._meta.object_name} '
+            'matches the given query.'
+        )
+
+    def get_list_tag(self):
+        return f'{self.list_tag}:{self.kwargs[self.parent_lookups[-1][1]]}'
+
+    def get_list_tags(self):
+        return (self.get_list_tag(), 'author:*')
+
+    def invalidate_list(self):
+        transaction.on_commit(
+            partial(response_cache.invalidate, self.get_list_tag())
+        )
+
+    def partial_update(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            if not self.perform_conditional_update(
+                self.get_write_queryset(), serializer.validated_data
+            ):
+                self.write_failed()
+            self.invalidate_list()
+        return Response(self.get_serializer(self.get_object()).data)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            if not self.perform_conditional_destroy(
+                self.get_write_queryset()
+            ):
+                self.write_failed()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_conditional_update(self, queryset, validated_data):
+        return queryset.update(**validated_data, updated_at=timezone.now())
+
+    def perform_conditional_destroy(self, queryset):
+        return queryset.delete()[0]
@@ -0,0 +1,256 @@
+import base64
+import binascii
+import hashlib
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.constants import COUNT_CACHE_TIMEOUT
+
+
+class CountlessPage(Page):
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountlessPaginator(Paginator):
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise PageNotAnInteger('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        if not object_list and number > 1:
+            raise EmptyPage('That page contains no results')
+        return CountlessPage(
+            object_list[:self.per_page],
+            number,
+            self,
+            has_next=len(object_list) > self.per_page
+        )
+
+    @cached_property
+    def count(self):
+        return None
+
+    @cached_property
+    def num_pages(self):
+        if self.count is None:
+            return 0
+        return super().num_pages
+
+
+class CachedCountPaginator(CountlessPaginator):
+
+    @cached_property
+    def count(self):
+        try:
+            query = str(self.object_list.query).encode()
+        except EmptyResultSet:
+            return 0
+        return cache.get_or_set(
+            f'page-count:{hashlib.md5(query).hexdigest()}',
+            self.object_list.count,
+            COUNT_CACHE_TIMEOUT
+        )
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimate_table_rows(self.object_list)
+            if estimate is not None:
+                return estimate
+        return super().count
+
+
+def estimate_table_rows(queryset):
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'sqlite':
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (table,))
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+    return max(int(str(row[0]).split()[0]), 0)
+
+
+class KeysetPagination(PageNumberPagination):
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    count_query_param = 'count'
+    count_paginators = {
+        'exact': Paginator,
+        'cached': CachedCountPaginator,
+        'estimated': EstimatedCountPaginator,
+        'none': CountlessPaginator,
+    }
+
+    def get_count_mode(self, request, view):
+        mode = request.query_params.get(self.count_query_param)
+        if mode in self.count_paginators:
+            return mode
+        return getattr(view, 'count_mode', 'exact')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            self.django_paginator_class = self.count_paginators[
+                self.get_count_mode(request, view)
+            ]
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = view.cursor_ordering
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.results = results[:self.page_size]
+        if self.reverse:
+            self.results.reverse()
+            self.has_next, self.has_previous = bool(self.results), has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None and bool(self.results)
+        return self.results
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return self.build_link(self.results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return self.build_link(self.results[0], reverse=True)
+
+    def build_link(self, obj, reverse):
+        position = [
+            self.encode_value(getattr(obj, field.lstrip('-')))
+            for field in self.ordering
+        ]
+        cursor = base64.urlsafe_b64encode(
+            json.dumps({'p': position, 'r': reverse}).encode()
+        ).decode()
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor['p'], bool(cursor['r'])
+            if not isinstance(position, list) or (
+                len(position) != len(self.ordering)
+            ):
+                raise ValueError('Cursor does not match the ordering')
+            position = [
+                self.decode_value(model, field.lstrip('-'), value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (
+            binascii.Error, KeyError, TypeError, ValueError, ValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    @staticmethod
+    def decode_value(model, name, value):
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError(f'Invalid cursor value for {name}')
+        value = model._meta.get_field(name).to_python(value)
+        if value is None:
+            raise ValueError(f'Invalid cursor value for {name}')
+        return value
+
+    @staticmethod
+    def encode_value(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after(ordering, position):
+        leading = ordering[0].lstrip('-')
+        bound = 'lte' if ordering[0].startswith('-') else 'gte'
+        conditions = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = [
+                Q(**{previous.lstrip('-'): value})
+                for previous, value in zip(ordering[:index], position)
+            ]
+            conditions.append(reduce(
+                and_, equal, Q(**{f'{name}__{lookup}': position[index]})
+            ))
+        return Q(**{f'{leading}__{bound}': position[0]}) & reduce(
+            or_, conditions
+        )
@@ -1,21 +1,57 @@
+from typing import NamedTuple, Optional
+
 from rest_framework import permissions
 
+from users.constants import ADMIN_ROLE_NAME, MODERATOR_ROLE_NAME
+
+
+class Principal(NamedTuple):
+    id: Optional[int]
+    role: Optional[str]
+    is_superuser: bool = False
+
+    @property
+    def is_authenticated(self):
+        return self.id is not None
+
+    @property
+    def is_admin(self):
+        return self.role == ADMIN_ROLE_NAME or self.is_superuser
+
+    @property
+    def is_moderator(self):
+        return self.role == MODERATOR_ROLE_NAME
+
+
+ANONYMOUS = Principal(None, None)
+
+
+def get_principal(request):
+    principal = getattr(request, 'principal', None)
+    if principal is None:
+        user = request.user
+        principal = request.principal = Principal(
+            user.pk, user.role, user.is_superuser
+        ) if user.is_authenticated else ANONYMOUS
+    return principal
+
 
 class IsStaffOrAuthorOrReadOnly(permissions.BasePermission):
 
     def has_permission(self, request, view):
         return (
             request.method in permissions.SAFE_METHODS
-            or request.user.is_authenticated
+            or get_principal(request).is_authenticated
         )
 
     def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        principal = get_principal(request)
         return (
-            request.method in permissions.SAFE_METHODS
-            or request.user.is_admin
-            or request.user.is_moderator
-            or obj.author == request.user
-            or request.user.is_superuser
+            principal.is_admin
+            or principal.is_moderator
+            or obj.author_id == principal.id
         )
 
 
@@ -24,8 +60,7 @@ class IsModeratorOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         return (
             request.method in permissions.SAFE_METHODS
-            or (request.user.is_authenticated
-                and request.user.is_moderator)
+            or get_principal(request).is_moderator
         )
 
 
@@ -34,18 +69,18 @@ class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         return (
             request.method in permissions.SAFE_METHODS
-            or (
-                request.user.is_authenticated
-                and (request.user.is_admin or request.user.is_superuser)
-            )
+            or get_principal(request).is_admin
         )
 
 
 class IsAdmin(permissions.BasePermission):
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and (request.user.is_admin
-                 or request.user.is_superuser)
-        )
+        return get_principal(request).is_admin
+
+
+class IsStaff(permissions.BasePermission):
+
+    def has_permission(self, request, view):
+        principal = get_principal(request)
+        return principal.is_admin or principal.is_moderator
@@ -0,0 +1,120 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from reviews.models import Comment, Review, Title
+
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class FullTextIndex:
+
+    def __init__(self, model, fields, weights):
+        self.model = model
+        self.fields = fields
+        self.weights = weights
+
+    @property
+    def content_table(self):
+        return self.model._meta.db_table
+
+    @property
+    def table(self):
+        return f'{self.content_table}_fts'
+
+    def is_supported(self, using):
+        return connections[using].vendor == 'sqlite'
+
+    def get_trigger_sql(self):
+        columns = ', '.join(self.fields)
+        new_values = ', '.join(f'new.{field}' for field in self.fields)
+        old_values = ', '.join(f'old.{field}' for field in self.fields)
+        insert = (
+            f'INSERT INTO {self.table}(rowid, {columns}) '
+            f'VALUES (new.id, {new_values});'
+        )
+        delete = (
+            f'INSERT INTO {self.table}({self.table}, rowid, {columns}) '
+            f"VALUES ('delete', old.id, {old_values});"
+        )
+        return (
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_insert '
+            f'AFTER INSERT ON {self.content_table} BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_delete '
+            f'AFTER DELETE ON {self.content_table} BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_update '
+            f'AFTER UPDATE OF {columns} ON {self.content_table} '
+            f'BEGIN {delete} {insert} END',
+        )
+
+    def install(self, using):
+        if not self.is_supported(using):
+            return
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            tables = connection.introspection.table_names(cursor)
+            if self.table in tables:
+                cursor.execute(f'SELECT 1 FROM {self.content_table} LIMIT 1')
+                if cursor.fetchone() is None:
+                    self.rebuild(using)
+                return
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE {self.table} USING fts5('
+                f'{", ".join(self.fields)}, '
+                f"content='{self.content_table}', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            weights = ', '.join(str(weight) for weight in self.weights)
+            cursor.execute(
+                f'INSERT INTO {self.table}({self.table}, rank) '
+                f"VALUES ('rank', 'bm25({weights})')"
+            )
+            for sql in self.get_trigger_sql():
+                cursor.execute(sql)
+        self.rebuild(using)
+
+    def rebuild(self, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+            )
+
+    @staticmethod
+    def build_match_query(text):
+        return ' '.join(
+            f'"{token}"' for token in SEARCH_TOKEN_PATTERN.findall(text)
+        )
+
+    def search(self, queryset, text):
+        match_query = self.build_match_query(text)
+        if not match_query:
+            return queryset.none()
+        if not self.is_supported(queryset.db):
+            condition = Q()
+            for field in self.fields:
+                condition |= Q(**{f'{field}__icontains': text})
+            return queryset.filter(condition)
+        return queryset.extra(
+            tables=(self.table,),
+            where=(
+                f'{self.table}.rowid = {self.content_table}.id',
+                f'{self.table} MATCH %s',
+            ),
+            params=(match_query,),
+            order_by=(f'{self.table}.rank',)
+        )
+
+
+title_search_index = FullTextIndex(
+    Title, fields=('name', 'description'), weights=(10.0, 1.0)
+)
+review_search_index = FullTextIndex(Review, fields=('text',), weights=(1.0,))
+comment_search_index = FullTextIndex(
+    Comment, fields=('text',), weights=(1.0,)
+)
+SEARCH_INDEXES = {
+    'titles': title_search_index,
+    'reviews': review_search_index,
+    'comments': comment_search_index,
+}
@@ -1,19 +1,26 @@
 import re
 import secrets
 import string
+from collections import defaultdict
+from operator import itemgetter
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import models
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from api.caching import fragment_cache
+from api.indexes import reference_snapshot
 from reviews.models import Category, Comment, Genre, Review, Title
-from users.models import User
+from users.models import OutgoingEmail, User
 from api.constants import (
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
     MAX_SCORE_VALUE,
     MIN_SCORE_VALUE,
+    TEXT_FIELD_LENGTH,
     USERNAME_LENGTH
 )
 from users.constants import CONFIRMATION_CODE_LENGTH, EMAIL_FIELD_LENGTH
@@ -25,10 +32,47 @@ def generate_confirmation_code(length=CONFIRMATION_CODE_LENGTH):
 
 
 def send_confirmation_email(email, confirmation_code):
-    send_mail(subject='Confirmation Code',
-              message=f'Your confirmation code is: {confirmation_code}',
-              from_email=settings.EMAIL_HOST_USER,
-              recipient_list=[email])
+    OutgoingEmail.objects.create(
+        subject='Confirmation Code',
+        body=f'Your confirmation code is: {confirmation_code}',
+        from_email=settings.EMAIL_HOST_USER,
+        recipient=email
+    )
+
+
+class FragmentCacheListSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        objects = list(
+            data.all() if isinstance(data, models.Manager) else data
+        )
+        return fragment_cache.render_many(
+            type(self.child).__name__,
+            objects,
+            self.render_fragments,
+            self.child.get_fragment_version
+        )
+
+    def render_fragments(self, objects):
+        return [
+            self.child.to_representation(obj)
+            for obj in self.child.prepare_fragments(objects)
+        ]
+
+
+class FragmentCacheMixin():
+
+    def get_fragment_version(self, obj):
+        return obj.updated_at.timestamp()
+
+    def prepare_fragments(self, objects):
+        return objects
+
+
+class AuthoredFragmentCacheMixin(FragmentCacheMixin):
+
+    def get_fragment_version(self, obj):
+        return f'{super().get_fragment_version(obj)}:{obj.author.username}'
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -138,12 +182,24 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class ReferenceSlugRelatedField(serializers.SlugRelatedField):
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        instance = reference_snapshot.resolve(
+            queryset.model, data, queryset.db
+        )
+        if instance is None:
+            return super().to_internal_value(data)
+        return instance
+
+
 class TitleCreateSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
+    category = ReferenceSlugRelatedField(
         queryset=Category.objects.all(),
         slug_field='slug',
     )
-    genre = serializers.SlugRelatedField(
+    genre = ReferenceSlugRelatedField(
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True,
@@ -152,33 +208,84 @@ class TitleCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('score_sum', 'review_count', 'updated_at')
+        read_only_fields = ('rating',)
+
+    def create(self, validated_data):
+        genres = validated_data.pop('genre', [])
+        title = super().create(validated_data)
+        title.genre.add(*genres)
+        title.genre_ids = [genre.pk for genre in genres]
+        return title
+
+    def update(self, title, validated_data):
+        title = super().update(title, validated_data)
+        if 'genre' in validated_data:
+            title.genre_ids = [genre.pk for genre in validated_data['genre']]
+        return title
 
     def to_representation(self, title):
         return TitleReadSerializer(title).data
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(
-        read_only=True,
-        many=True
-    )
-    rating = serializers.IntegerField(
-        source='title_rating',
-        read_only=True
-    )
+class TitleReadSerializer(FragmentCacheMixin, serializers.ModelSerializer):
+    category = serializers.SerializerMethodField()
+    genre = serializers.SerializerMethodField()
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('score_sum', 'review_count', 'updated_at')
+        list_serializer_class = FragmentCacheListSerializer
+
+    def prepare_fragments(self, titles):
+        genre_ids = defaultdict(list)
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=[title.pk for title in titles]
+        ).values_list('title_id', 'genre_id'):
+            genre_ids[title_id].append(genre_id)
+        for title in titles:
+            title.genre_ids = genre_ids[title.pk]
+        return titles
+
+    def get_category(self, title):
+        if title.category_id is None:
+            return None
+        return reference_snapshot.describe(Category, title.category_id)
+
+    def get_genre(self, title):
+        genre_ids = getattr(title, 'genre_ids', None)
+        if genre_ids is None:
+            genre_ids = title.genre.through.objects.filter(
+                title_id=title.pk
+            ).values_list('genre_id', flat=True)
+        return sorted(
+            (
+                reference_snapshot.describe(Genre, genre_id)
+                for genre_id in genre_ids
+            ),
+            key=itemgetter('name')
+        )
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=TEXT_FIELD_LENGTH)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=AUTOCOMPLETE_MAX_LIMIT,
+        default=AUTOCOMPLETE_LIMIT
+    )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(AuthoredFragmentCacheMixin,
+                       serializers.ModelSerializer):
+    select_related_fields = ('author',)
+    default_error_messages = {
+        'duplicate_review': 'You can leave only one review for a title!'
+    }
+
     author = serializers.SlugRelatedField(
-        queryset=User.objects.all(),
-        slug_field='username',
-        default=serializers.CurrentUserDefault()
+        read_only=True,
+        slug_field='username'
     )
     score = serializers.IntegerField(
         min_value=MIN_SCORE_VALUE,
@@ -188,30 +295,36 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
+        list_serializer_class = FragmentCacheListSerializer
 
-    def validate(self, data):
-        user = self.context['request'].user
-        title = self.context['view'].kwargs['title_id']
-        if (
-            Review.objects.filter(
-                author=user,
-                title=title
-            ).exists()
-            and self.context['request'].method == 'POST'
-        ):
-            raise serializers.ValidationError(
-                'You can leave only one review for a title!'
-            )
-        return data
 
+class CommentSerializer(AuthoredFragmentCacheMixin,
+                        serializers.ModelSerializer):
+    select_related_fields = ('author',)
 
-class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
-        queryset=User.objects.all(),
-        slug_field='username',
-        default=serializers.CurrentUserDefault()
+        read_only=True,
+        slug_field='username'
     )
 
     class Meta:
         fields = ('id', 'text', 'author', 'pub_date')
         model = Comment
+        list_serializer_class = FragmentCacheListSerializer
+
+
+class ReviewSearchSerializer(ReviewSerializer):
+
+    class Meta:
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+        model = Review
+
+
+class CommentSearchSerializer(CommentSerializer):
+    select_related_fields = ('author', 'review')
+
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+
+    class Meta:
+        fields = ('id', 'title', 'review', 'text', 'author', 'pub_date')
+        model = Comment
@@ -0,0 +1,247 @@
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_migrate,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api.authentication import (PRINCIPAL_FIELDS, invalidate_principal,
+                                verified_tokens)
+from api.caching import response_cache
+from api.indexes import (live_ids, reference_snapshot, revoked_tokens,
+                         title_autocomplete, title_index)
+from api.search import SEARCH_INDEXES
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import catalog_imported, title_rating_changed
+from users.models import RevokedToken, User
+
+
+@receiver(post_migrate)
+def clear_cache(sender, **kwargs):
+    for cache in caches.all():
+        cache.clear()
+    verified_tokens.clear()
+    revoked_tokens.invalidate()
+
+
+@receiver(post_migrate)
+def install_search_indexes(sender, using, **kwargs):
+    if sender.name == 'reviews':
+        for index in SEARCH_INDEXES.values():
+            index.install(using)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    def update():
+        title_index.set_category(instance.pk, instance.category_id)
+        title_autocomplete.upsert(instance.pk, instance.name, instance.rating)
+    transaction.on_commit(update)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    title_id = instance.pk
+
+    def update():
+        title_index.remove_title(title_id)
+        title_autocomplete.remove(title_id)
+    transaction.on_commit(update)
+
+
+@receiver(title_rating_changed)
+def update_autocomplete_rating(sender, title_id, **kwargs):
+    transaction.on_commit(lambda: title_autocomplete.set_rating(title_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def index_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        transaction.on_commit(title_index.invalidate)
+    elif action == 'post_add':
+        transaction.on_commit(
+            lambda: title_index.add_genres(instance.pk, pk_set)
+        )
+    elif action == 'post_remove':
+        transaction.on_commit(
+            lambda: title_index.remove_genres(instance.pk, pk_set)
+        )
+    else:
+        transaction.on_commit(lambda: title_index.remove_genres(instance.pk))
+
+
+@receiver((post_save, post_delete), sender=Genre)
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_title_index(sender, **kwargs):
+    transaction.on_commit(title_index.invalidate)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def snapshot_reference(sender, instance, **kwargs):
+    transaction.on_commit(lambda: reference_snapshot.upsert(
+        sender, instance.pk, instance.name, instance.slug
+    ))
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def unsnapshot_reference(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: reference_snapshot.remove(sender, pk))
+
+
+@receiver((post_save, pre_delete), sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    Title.objects.filter(genre=instance).update(updated_at=timezone.now())
+
+
+@receiver((post_save, pre_delete), sender=Category)
+def touch_category_titles(sender, instance, **kwargs):
+    Title.objects.filter(category=instance).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_linked_titles(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action in ('post_add', 'post_remove'):
+        Title.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+    elif reverse and action == 'pre_clear':
+        instance.titles.update(updated_at=timezone.now())
+
+
+def invalidate_responses(*tags):
+    transaction.on_commit(lambda: response_cache.invalidate(*tags))
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title_responses(sender, instance, **kwargs):
+    invalidate_responses(f'title:{instance.pk}', 'title:*')
+
+
+@receiver(title_rating_changed)
+def invalidate_rated_title_responses(sender, title_id, **kwargs):
+    invalidate_responses(f'title:{title_id}', 'title:*')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_linked_title_responses(sender, instance, action, reverse,
+                                      pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        invalidate_responses('genre:*')
+    else:
+        invalidate_responses(f'title:{instance.pk}', 'title:*')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genre_responses(sender, **kwargs):
+    invalidate_responses('genre:*')
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category_responses(sender, **kwargs):
+    invalidate_responses('category:*')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+def add_live_id(sender, instance, created, **kwargs):
+    if created:
+        pk = instance.pk
+        transaction.on_commit(lambda: live_ids[sender].add(pk))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+def remove_live_id(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: live_ids[sender].remove(pk))
+
+
+@receiver(post_save, sender=Review)
+def invalidate_saved_review_responses(sender, instance, **kwargs):
+    previous = getattr(instance, 'loaded_rating', None)
+    title_ids = {instance.title_id, previous and previous[0]} - {None}
+    invalidate_responses(*(f'reviews:{title_id}' for title_id in title_ids))
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review_responses(sender, instance, **kwargs):
+    invalidate_responses(
+        f'reviews:{instance.title_id}', f'comments:{instance.pk}'
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment_responses(sender, instance, **kwargs):
+    invalidate_responses(f'comments:{instance.review_id}')
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    rating = (instance.title_id, instance.score)
+    previous = getattr(instance, 'loaded_rating', None)
+    if created:
+        Title.update_rating(instance.title_id, instance.score, 1)
+    elif previous is not None and previous != rating:
+        title_id, score = previous
+        if title_id == instance.title_id:
+            Title.update_rating(title_id, instance.score - score)
+        else:
+            Title.update_rating(title_id, -score, -1)
+            Title.update_rating(instance.title_id, instance.score, 1)
+    instance.loaded_rating = rating
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    Title.update_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(catalog_imported)
+def invalidate_imported_catalog(sender, **kwargs):
+    for index in (
+        title_index, title_autocomplete, reference_snapshot,
+        *live_ids.values()
+    ):
+        index.invalidate()
+    response_cache.invalidate('title:*', 'genre:*', 'category:*')
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user_principal(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(PRINCIPAL_FIELDS) & set(
+        update_fields
+    ):
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_principal(user_id))
+
+
+@receiver(post_save, sender=RevokedToken)
+def index_revoked_token(sender, instance, created, **kwargs):
+    if created:
+        pk, jti = instance.pk, instance.jti
+        transaction.on_commit(lambda: revoked_tokens.add(pk, jti))
+
+
+@receiver(post_save, sender=User)
+def touch_renamed_author_posts(sender, instance, created, **kwargs):
+    previous = getattr(instance, 'loaded_username', None)
+    if created or previous is None or previous == instance.username:
+        return
+    now = timezone.now()
+    Review.objects.filter(author=instance).update(updated_at=now)
+    Comment.objects.filter(author=instance).update(updated_at=now)
+    instance.loaded_username = instance.username
+    invalidate_responses('author:*')
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_author_responses(sender, **kwargs):
+    invalidate_responses('author:*')
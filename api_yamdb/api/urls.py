@@ -2,9 +2,11 @@ from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 
 from api.constants import API_VERSION
-from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       ReviewViewSet, SignUpView, TitleViewSet, TokenView,
-                       UserProfileView, UsersViewSet)
+from api.views import (CategoryViewSet, CommentSearchViewSet,
+                       CommentViewSet, GenreViewSet, ReviewSearchViewSet,
+                       ReviewViewSet, SignUpView, TitleViewSet,
+                       TokenRevokeView, TokenView, UserProfileView,
+                       UsersViewSet)
 
 
 app_name = 'api'
@@ -25,10 +27,25 @@ router.register(
     CommentViewSet,
     basename='comments'
 )
+router.register(
+    r'search/reviews',
+    ReviewSearchViewSet,
+    basename='search-reviews'
+)
+router.register(
+    r'search/comments',
+    CommentSearchViewSet,
+    basename='search-comments'
+)
 
 urlpatterns = [
     path(API_VERSION + 'auth/signup/', SignUpView.as_view(), name='signup'),
     path(API_VERSION + 'auth/token/', TokenView.as_view(), name='token'),
+    path(
+        API_VERSION + 'auth/token/revoke/',
+        TokenRevokeView.as_view(),
+        name='token_revoke'
+    ),
     path(
         API_VERSION + 'users/me/',
         UserProfileView.as_view(),
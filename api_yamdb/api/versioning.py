@@ -0,0 +1,101 @@
+import threading
+import time
+
+from api.cache_backends import shared_cache
+from api.constants import REMOVAL_LOG_LENGTH, REMOVAL_LOG_TIMEOUT
+
+VERSION_KEY_TEMPLATE = 'version:{}'
+REMOVAL_KEY_TEMPLATE = 'removal:{}:{}'
+
+
+def get_version(name):
+    return shared_cache.get_or_set(
+        VERSION_KEY_TEMPLATE.format(name), time.time_ns, None
+    )
+
+
+def bump_version(name):
+    key = VERSION_KEY_TEMPLATE.format(name)
+    try:
+        return shared_cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        shared_cache.set(key, version, None)
+        return version
+
+
+class VersionedIndex:
+    version_name = None
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        self.epoch = None
+
+    def build(self):
+        raise NotImplementedError
+
+    def catch_up(self):
+        return False
+
+    def refresh(self):
+        version = get_version(self.version_name)
+        with self.lock:
+            if version == self.version:
+                return
+            epoch = get_version(f'{self.version_name}:epoch')
+            if (
+                self.version is None or epoch != self.epoch
+                or not self.catch_up()
+            ):
+                self.build()
+            self.version = version
+            self.epoch = epoch
+
+    def apply(self, change):
+        with self.lock:
+            version = bump_version(self.version_name)
+            if self.version is None or version != self.version + 1:
+                return
+            try:
+                change()
+            except KeyError:
+                self.version = None
+            else:
+                self.version = version
+
+    def invalidate(self):
+        with self.lock:
+            bump_version(f'{self.version_name}:epoch')
+            bump_version(self.version_name)
+            self.version = None
+
+
+class RemovalLog:
+    """Recently removed ids, numbered like a version counter."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def position(self):
+        return get_version(self.name)
+
+    def record(self, pk):
+        number = bump_version(self.name)
+        shared_cache.set(
+            REMOVAL_KEY_TEMPLATE.format(self.name, number), pk,
+            REMOVAL_LOG_TIMEOUT
+        )
+        return number
+
+    def read(self, start, stop):
+        if not 0 <= stop - start <= REMOVAL_LOG_LENGTH:
+            return None
+        keys = [
+            REMOVAL_KEY_TEMPLATE.format(self.name, number)
+            for number in range(start + 1, stop + 1)
+        ]
+        removed = shared_cache.get_many(keys)
+        if len(removed) != len(keys):
+            return None
+        return list(removed.values())
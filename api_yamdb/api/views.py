@@ -1,48 +1,95 @@
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, Subquery
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import permissions, views, viewsets
+from rest_framework import mixins, permissions, status, views, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from api import serializers
+from api.authentication import (CachedJWTAuthentication, get_access_token,
+                                revoke_token)
 from api.mixins import (
     CategoryGenreMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
     PutNotAllowedMixin,
+    ResponseCacheMixin,
     ReviewCommentMixin
 )
 from api.permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
+    IsStaff,
 )
-from api.filters import TitleFilter
-from reviews.models import Category, Genre, Review, Title
+from api.filters import (
+    CommentSearchFilter,
+    FullTextSearchFilter,
+    ReviewSearchFilter,
+    TitleFilter
+)
+from api.indexes import title_autocomplete
+from api.pagination import KeysetPagination
+from api.search import (
+    comment_search_index,
+    review_search_index,
+    title_search_index
+)
+from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
 
-class TitleViewSet(PutNotAllowedMixin, viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(title_rating=Avg(
-        'reviews__score'
-    )).order_by('name')
+class TitleViewSet(
+    ResponseCacheMixin,
+    PutNotAllowedMixin,
+    EagerLoadingMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.order_by('name')
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, FullTextSearchFilter)
     filterset_class = TitleFilter
+    search_index = title_search_index
+    pagination_class = KeysetPagination
+    cursor_ordering = ('name', 'id')
+    cache_tag = 'title'
+    cache_dependencies = ('genre', 'category')
+    coalesce_misses = True
+
+    def get_list_tags(self):
+        return self.get_cache_tags(None)
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return serializers.TitleReadSerializer
         return serializers.TitleCreateSerializer
 
+    @action(detail=False, pagination_class=None, filter_backends=())
+    def autocomplete(self, request):
+        serializer = serializers.AutocompleteQuerySerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response({'results': title_autocomplete.suggest(
+            serializer.validated_data['q'],
+            serializer.validated_data['limit']
+        )})
+
 
 class GenreViewSet(CategoryGenreMixin):
     queryset = Genre.objects.all()
+    cache_tag = 'genre'
     serializer_class = serializers.GenreSerializer
 
 
 class CategoryViewSet(CategoryGenreMixin):
     queryset = Category.objects.all()
+    cache_tag = 'category'
     serializer_class = serializers.CategorySerializer
 
 
@@ -66,16 +113,24 @@ class TokenView(TokenObtainPairView):
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data.get('username')
         user = get_object_or_404(User, username=username)
-        access = AccessToken.for_user(user)
+        access = get_access_token(user)
         user.confirmation_code = None
-        user.save()
+        user.save(update_fields=('confirmation_code',))
         return Response({'token': str(access)})
 
 
+class TokenRevokeView(views.APIView):
+    authentication_classes = (CachedJWTAuthentication,)
+
+    def post(self, request, *args, **kwargs):
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class UserProfileView(views.APIView):
 
     def get_user(self):
-        return self.request.user
+        return User.objects.get(pk=self.request.user.pk)
 
     def get(self, request, format=None):
         serializer = serializers.UserProfileSerializer(self.get_user())
@@ -106,29 +161,73 @@ class UsersViewSet(PutNotAllowedMixin, viewsets.ModelViewSet):
 class ReviewViewSet(ReviewCommentMixin):
     queryset = Review.objects.all()
     serializer_class = serializers.ReviewSerializer
+    parent_model = Title
+    parent_lookups = ((Title, 'title_id', 'pk'),)
+    list_tag = 'reviews'
+
+    def get_queryset(self):
+        self.ensure_live(Title, self.kwargs['title_id'])
+        return super().get_queryset().filter(title_id=self.kwargs['title_id'])
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=self.get_db_object(Title, self.kwargs['title_id'])
-        )
+        title = self.get_parent()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=self.request.user, title=title
+            ).exists():
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [
+                    serializer.error_messages['duplicate_review']
+                ]},
+                code='duplicate_review'
+            )
+
+    def perform_conditional_update(self, queryset, validated_data):
+        if 'score' in validated_data and not Title.update_rating(
+            self.kwargs['title_id'],
+            validated_data['score'] - Subquery(queryset.values('score')),
+            0,
+            Exists(queryset)
+        ):
+            return 0
+        return super().perform_conditional_update(queryset, validated_data)
 
 
 class CommentViewSet(ReviewCommentMixin):
     serializer_class = serializers.CommentSerializer
+    parent_model = Review
+    parent_lookups = (
+        (Title, 'title_id', 'title_id'),
+        (Review, 'review_id', 'pk'),
+    )
+    list_tag = 'comments'
 
     def get_queryset(self):
-        review = self.get_db_object(
-            Review,
-            self.kwargs['review_id'],
-            title=self.kwargs['title_id']
-        )
-        return review.comments.all()
+        return self.apply_eager_loading(self.get_parent().comments.all())
 
     def perform_create(self, serializer):
-        review = self.get_db_object(
-            Review,
-            self.kwargs['review_id'],
-            title=self.kwargs['title_id']
-        )
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
+
+
+class ReviewSearchViewSet(
+    EagerLoadingMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    queryset = Review.objects.all()
+    serializer_class = serializers.ReviewSearchSerializer
+    permission_classes = (IsStaff,)
+    filter_backends = (DjangoFilterBackend, FullTextSearchFilter)
+    filterset_class = ReviewSearchFilter
+    search_index = review_search_index
+
+
+class CommentSearchViewSet(ReviewSearchViewSet):
+    queryset = Comment.objects.all()
+    serializer_class = serializers.CommentSearchSerializer
+    filterset_class = CommentSearchFilter
+    search_index = comment_search_index
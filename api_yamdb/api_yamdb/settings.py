@@ -1,3 +1,6 @@
+import hashlib
+import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -40,13 +43,15 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.TokenAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
 
+PRINCIPAL_TOKEN_CLAIMS = True
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -61,6 +66,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.IdentityMapMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -92,6 +98,38 @@ DATABASES = {
     }
 }
 
+SHARED_CACHE_DIR = os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+    f'api_yamdb-{os.geteuid()}'
+)
+SHARED_CACHE_PREFIX = hashlib.sha1(
+    str(DATABASES['default']['NAME']).encode()
+).hexdigest()[:12]
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+    'shared': {
+        'BACKEND': 'api.cache_backends.SharedMemoryCache',
+        'LOCATION': os.getenv(
+            'SHARED_CACHE_PATH',
+            os.path.join(SHARED_CACHE_DIR, f'{SHARED_CACHE_PREFIX}.cache')
+        ),
+        'KEY_PREFIX': SHARED_CACHE_PREFIX,
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 8192,
+            'SLOT_SIZE': 2048,
+            'WAYS': 8,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
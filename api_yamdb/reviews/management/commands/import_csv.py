@@ -1,6 +1,7 @@
 import csv
 import os
 
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
 from reviews.models import (Category, Comment, User, Genre,
@@ -39,5 +40,6 @@ class Command(BaseCommand):
                         self.stdout.write(f'Error in row {row.get("id")}.'
                                           f' Error text - {error}')
                 model_class.objects.bulk_create(row_list)
+        call_command('rebuild_ratings', stdout=self.stdout)
 
         self.stdout.write(self.style.SUCCESS('Data loaded successfully'))
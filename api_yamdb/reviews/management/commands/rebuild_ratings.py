@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.signals import catalog_imported
+
+
+class Command(BaseCommand):
+    help = 'Rebuild title rating counters from reviews'
+
+    def handle(self, *args, **options):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        with transaction.atomic():
+            updated = Title.objects.update(
+                score_sum=Coalesce(Subquery(
+                    reviews.annotate(total=Sum('score')).values('total')
+                ), 0),
+                review_count=Coalesce(Subquery(
+                    reviews.annotate(total=Count('id')).values('total')
+                ), 0)
+            )
+            Title.objects.update(
+                rating=F('score_sum') / NullIf(F('review_count'), 0),
+                updated_at=timezone.now()
+            )
+            transaction.on_commit(
+                lambda: catalog_imported.send(sender=self.__class__)
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Ratings rebuilt for {updated} titles')
+        )
@@ -1,7 +1,11 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import NullIf
+from django.utils import timezone
 
 from api.constants import MAX_SCORE_VALUE, MIN_SCORE_VALUE, TEXT_FIELD_LENGTH
+from reviews.signals import title_rating_changed
 from reviews.validators import validate_year
 from users.models import User
 
@@ -15,6 +19,11 @@ class Category(models.Model):
         unique=True,
         verbose_name='Slug'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Last modified'
+    )
 
     class Meta:
         verbose_name = 'Category'
@@ -31,6 +40,11 @@ class Genre(models.Model):
         verbose_name='Name'
     )
     slug = models.SlugField(unique=True, verbose_name='Slug')
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Last modified'
+    )
 
     class Meta:
         verbose_name = 'Genre'
@@ -74,15 +88,46 @@ class Title(models.Model):
         blank=True,
         verbose_name='Rating'
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Sum of review scores'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of reviews'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Last modified'
+    )
 
     class Meta:
         verbose_name = 'Title'
         verbose_name_plural = 'titles'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def update_rating(cls, title_id, score_delta=0, count_delta=0,
+                      *conditions):
+        score_sum = F('score_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        updated = cls.objects.filter(pk=title_id).filter(*conditions).update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=score_sum / NullIf(review_count, 0),
+            updated_at=timezone.now()
+        )
+        if updated:
+            title_rating_changed.send(sender=cls, title_id=title_id)
+        return updated
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -108,6 +153,11 @@ class Review(models.Model):
         auto_now_add=True,
         verbose_name='Publication date'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Last modified'
+    )
 
     class Meta:
         verbose_name = 'Review'
@@ -119,10 +169,24 @@ class Review(models.Model):
         ]
         ordering = ('pub_date',)
         default_related_name = 'reviews'
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
 
     def str(self):
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_rating = (
+            instance.__dict__.get('title_id'), instance.__dict__.get('score')
+        )
+        return instance
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -140,12 +204,23 @@ class Comment(models.Model):
         auto_now_add=True,
         verbose_name='Publication date'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Last modified'
+    )
 
     class Meta:
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
         default_related_name = 'comments'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
 
     def str(self):
         return self.text
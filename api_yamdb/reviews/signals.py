@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+title_rating_changed = Signal()
+catalog_imported = Signal()
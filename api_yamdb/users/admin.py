@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from users.models import User
+from users.models import OutgoingEmail, RevokedToken, User
 ist_filter = ('pub_date', 'review')
 
 
@@ -17,3 +17,27 @@ class UsertAdmin(admin.ModelAdmin):
     list_editable = (
         'role',
     )
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = (
+        'jti',
+        'user',
+        'expires_at',
+        'revoked_at',
+    )
+    search_fields = ('jti', 'user__username',)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
@@ -1,6 +1,14 @@
 CONFIRMATION_CODE_LENGTH: int = 6
 EMAIL_FIELD_LENGTH: int = 254
+JTI_FIELD_LENGTH: int = 255
 ROLE_FIELD_LENGTH: int = 20
+SUBJECT_FIELD_LENGTH: int = 255
+
+OUTBOX_BATCH_SIZE: int = 100
+OUTBOX_MAX_ATTEMPTS: int = 8
+OUTBOX_MAX_RETRY_DELAY: int = 3600
+OUTBOX_POLL_INTERVAL: int = 5
+OUTBOX_RETRY_DELAY: int = 30
 
 USER_ROLE_NAME: str = 'user'
 MODERATOR_ROLE_NAME: str = 'moderator'
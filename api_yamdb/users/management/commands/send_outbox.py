@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_RETRY_DELAY,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_RETRY_DELAY
+)
+from users.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails in batches over one mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=OUTBOX_BATCH_SIZE)
+        parser.add_argument('--interval', type=float,
+                            default=OUTBOX_POLL_INTERVAL)
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the outbox once and exit')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, deferred {failed}')
+            if options['once']:
+                break
+            if not sent:
+                time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        sent = failed = 0
+        batch = self.next_batch(batch_size)
+        if not batch:
+            return sent, failed
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            return sent, self.defer(batch, error)
+        try:
+            while batch:
+                delivered, undelivered = [], []
+                for email in batch:
+                    try:
+                        connection.send_messages([EmailMessage(
+                            email.subject, email.body, email.from_email,
+                            [email.recipient], connection=connection
+                        )])
+                    except Exception as error:
+                        email.last_error = str(error)
+                        undelivered.append(email)
+                    else:
+                        delivered.append(email.pk)
+                OutgoingEmail.objects.filter(pk__in=delivered).update(
+                    sent_at=timezone.now()
+                )
+                sent += len(delivered)
+                failed += self.defer(undelivered)
+                if undelivered:
+                    break
+                batch = self.next_batch(batch_size)
+        finally:
+            connection.close()
+        return sent, failed
+
+    @staticmethod
+    def next_batch(batch_size):
+        return list(OutgoingEmail.objects.filter(
+            sent_at__isnull=True,
+            next_attempt_at__lte=timezone.now(),
+            attempts__lt=OUTBOX_MAX_ATTEMPTS
+        )[:batch_size])
+
+    @staticmethod
+    def defer(emails, error=None):
+        now = timezone.now()
+        for email in emails:
+            if error is not None:
+                email.last_error = str(error)
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(seconds=min(
+                OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1),
+                OUTBOX_MAX_RETRY_DELAY
+            ))
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'next_attempt_at', 'last_error')
+        )
+        return len(emails)
@@ -1,11 +1,14 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.db.models import CheckConstraint, Q
+from django.utils import timezone
 
 from users.constants import (
     CONFIRMATION_CODE_LENGTH,
     EMAIL_FIELD_LENGTH,
+    JTI_FIELD_LENGTH,
     ROLE_FIELD_LENGTH,
+    SUBJECT_FIELD_LENGTH,
     USER_ROLE_CHOICES,
     USER_ROLE_NAME,
     MODERATOR_ROLE_NAME,
@@ -52,6 +55,12 @@ class User(AbstractUser):
     def __str__(self) -> str:
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_username = instance.__dict__.get('username')
+        return instance
+
     @property
     def is_admin(self):
         return self.role == ADMIN_ROLE_NAME
@@ -59,3 +68,86 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == MODERATOR_ROLE_NAME
+
+
+class RevokedToken(models.Model):
+    jti = models.CharField(
+        max_length=JTI_FIELD_LENGTH,
+        unique=True,
+        verbose_name='Token identifier'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='revoked_tokens',
+        verbose_name='User'
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Expires at'
+    )
+    revoked_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Revoked at'
+    )
+
+    class Meta:
+        verbose_name = 'Revoked token'
+        verbose_name_plural = 'Revoked tokens'
+        ordering = ('-revoked_at',)
+
+    def __str__(self) -> str:
+        return self.jti
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(
+        max_length=SUBJECT_FIELD_LENGTH,
+        verbose_name='Subject'
+    )
+    body = models.TextField(verbose_name='Body')
+    from_email = models.EmailField(
+        max_length=EMAIL_FIELD_LENGTH,
+        verbose_name='Sender'
+    )
+    recipient = models.EmailField(
+        max_length=EMAIL_FIELD_LENGTH,
+        verbose_name='Recipient'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Queued at'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Next attempt at'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Delivery attempts'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Last delivery error'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Sent at'
+    )
+
+    class Meta:
+        verbose_name = 'Outgoing email'
+        verbose_name_plural = 'Outgoing emails'
+        ordering = ('next_attempt_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outbox_pending_idx'
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.subject} to {self.recipient}'
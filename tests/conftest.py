@@ -1,5 +1,7 @@
 import os
+import shutil
 import sys
+import tempfile
 
 from django.utils.version import get_version
 
@@ -33,3 +35,17 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+def pytest_configure(config):
+    from django.conf import settings
+
+    config.shared_cache_dir = tempfile.mkdtemp(prefix='api_yamdb-tests-')
+    settings.CACHES['shared'].update({
+        'LOCATION': os.path.join(config.shared_cache_dir, 'shared.cache'),
+        'KEY_PREFIX': 'tests',
+    })
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.shared_cache_dir, ignore_errors=True)
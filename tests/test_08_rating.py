@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from api.indexes import title_autocomplete
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    @staticmethod
+    def find_rating(response, title_id):
+        for title in response.json()['results']:
+            if title['id'] == title_id:
+                return title['rating']
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_writes(self, client, admin_client,
+                                             admin, user, user_client,
+                                             moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        for review in reviews:
+            response = admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=review['id']
+                )
+            )
+            assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что после удаления всех отзывов рейтинг '
+            'произведения равен `None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, client, admin_client, admin,
+                                        user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+        title_autocomplete.invalidate()
+        assert title_autocomplete.suggest(titles[0]['name'], 1)[0][
+            'rating'
+        ] is None
+        response = client.get(self.TITLES_URL)
+        assert self.find_rating(response, title_id) is None
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count) == (10, 2), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'счётчики оценок произведений.'
+        )
+        assert self.get_rating(client, title_id) == 5
+        refreshed = client.get(
+            self.TITLES_URL, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert refreshed.status_code == HTTPStatus.OK, (
+            'Проверьте, что команда `rebuild_ratings` сбрасывает кэш '
+            'ответов со списком произведений.'
+        )
+        assert self.find_rating(refreshed, title_id) == 5
+        assert title_autocomplete.suggest(titles[0]['name'], 1)[0][
+            'rating'
+        ] == 5
+
+    def test_03_cascade_delete_updates_rating(self, client, admin_client,
+                                              admin, user, user_client,
+                                              moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count) == (10, 2), (
+            'Проверьте, что счётчики оценок пересчитываются при каскадном '
+            'удалении отзывов вместе с пользователем.'
+        )
+
+        moderator.delete()
+        assert self.get_rating(client, title_id) == 5
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count) == (5, 1)
@@ -0,0 +1,121 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Pagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def walk(self, client, url, link):
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с параметром `cursor` '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data
+            pages.append([title['id'] for title in data['results']])
+            url = data[link]
+        return pages
+
+    def test_01_cursor_walks_every_title_once(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Title {index % 7}', year=2000)
+            for index in range(25)
+        )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        pages = self.walk(client, f'{self.TITLES_URL}?cursor=', 'next')
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация возвращает каждое '
+            'произведение ровно один раз в порядке (`name`, `id`).'
+        )
+
+        url = client.get(f'{self.TITLES_URL}?cursor=').json()['next']
+        url = client.get(url).json()['next']
+        backward = self.walk(client, url, 'previous')
+        assert sum(reversed(backward), []) == expected, (
+            'Проверьте, что ссылка `previous` курсорной пагинации '
+            'возвращает предыдущие страницы.'
+        )
+
+    def test_02_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=invalid')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        title = Title.objects.create(name='Title', year=2000)
+        reviews_url = f'{self.TITLES_URL}{title.id}/reviews/'
+        forged = (
+            (self.TITLES_URL, ['a', 'x']),
+            (self.TITLES_URL, [None, None]),
+            (self.TITLES_URL, [['a'], {'b': 1}]),
+            (reviews_url, ['yesterday', 1]),
+            (reviews_url, ['2023-01-01T00:00:00', 'x']),
+        )
+        for url, position in forged:
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({'p': position, 'r': False}).encode()
+            ).decode()
+            response = client.get(f'{url}?cursor={cursor}')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор с некорректными значениями '
+                'отклоняется со статусом 404.'
+            )
+
+    def test_03_page_number_pagination_by_default(self, client):
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'count' in response.json()
+
+    def test_04_countless_pagination(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Title {index}', year=2000) for index in range(15)
+        )
+        response = client.get(f'{self.TITLES_URL}?count=none')
+        data = response.json()
+        assert data['count'] is None, (
+            'Проверьте, что при `count=none` пагинатор не выполняет '
+            'подсчёт объектов.'
+        )
+        assert len(data['results']) == 10
+        assert data['next'] and data['previous'] is None
+
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 5
+        assert data['next'] is None and data['previous']
+
+        response = client.get(f'{self.TITLES_URL}?count=none&page=3')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_cached_count(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Title {index}', year=2000) for index in range(3)
+        )
+        response = client.get(f'{self.TITLES_URL}?count=cached')
+        assert response.json()['count'] == 3
+
+    def test_06_empty_search_count(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Title {index}', year=2000) for index in range(3)
+        )
+        for mode in ('cached', 'estimated'):
+            response = client.get(
+                f'{self.TITLES_URL}?count={mode}&search=!!!'
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что при `count={mode}` поиск без слов '
+                'возвращает пустой список, а не ошибку.'
+            )
+            data = response.json()
+            assert data['count'] == 0 and data['results'] == []
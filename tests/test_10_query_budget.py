@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.indexes import live_ids, reference_snapshot
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+QUERY_BUDGETS = {
+    '/api/v1/titles/': 4,
+    '/api/v1/titles/{title_id}/': 3,
+    '/api/v1/titles/{title_id}/reviews/': 3,
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/': 4,
+    '/api/v1/categories/': 0,
+    '/api/v1/genres/': 0,
+}
+
+
+def create_catalog(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(3)
+    ]
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(size)
+    )
+    titles = []
+    for index in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {index}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    reviews = []
+    for index in range(size):
+        author = User.objects.create(
+            username=f'author{index}', email=f'author{index}@yamdb.fake'
+        )
+        reviews.append(Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=5
+        ))
+        Comment.objects.create(review=reviews[0], author=author, text='Текст')
+    return titles[0], reviews[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryBudget:
+
+    @pytest.mark.parametrize('url_template', QUERY_BUDGETS)
+    @pytest.mark.parametrize('size', (1, 10))
+    def test_01_query_count_does_not_grow(self, client, url_template, size):
+        title, review = create_catalog(size)
+        for index in (reference_snapshot, *live_ids.values()):
+            index.refresh()
+        url = url_template.format(title_id=title.id, review_id=review.id)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(context.captured_queries) <= QUERY_BUDGETS[url_template], (
+            f'Проверьте, что GET-запрос к `{url_template}` выполняет не '
+            f'больше {QUERY_BUDGETS[url_template]} SQL-запросов независимо '
+            'от количества объектов на странице. Выполнено запросов: '
+            f'{len(context.captured_queries)}.'
+        )
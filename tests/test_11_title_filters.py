@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_names(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{query}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return {title['name'] for title in response.json()['results']}
+
+    def test_01_multi_value_filters(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['name'], titles[1]['name']
+        cases = {
+            'genre=horror,drama': {terminator, die_hard},
+            'genre=horror,drama&genre_mode=all': set(),
+            'genre=horror,comedy&genre_mode=all': {terminator},
+            'category=films,books': {terminator, die_hard},
+            'category=books&genre=horror,drama': {die_hard},
+            'genre=horr': set(),
+        }
+        for query, expected in cases.items():
+            assert self.get_names(client, query) == expected, (
+                'Проверьте фильтрацию произведений по нескольким жанрам и '
+                f'категориям: запрос `?{query}` вернул некорректный результат.'
+            )
+
+    def test_02_filters_follow_title_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'genre': ['horror'], 'category': 'films'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_names(client, 'genre=horror&category=films') == {
+            titles[0]['name'], titles[1]['name']
+        }
+        assert self.get_names(client, 'genre=drama') == set()
+
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert self.get_names(client, 'genre=horror') == {titles[1]['name']}
+
+        admin_client.delete('/api/v1/genres/horror/')
+        assert self.get_names(client, 'genre=horror') == set()
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, text):
+        response = client.get(self.TITLES_URL, {'search': text})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?search=` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'терминатор') == [titles[0]['name']]
+        assert self.search(client, 'yippie') == [titles[1]['name']], (
+            'Проверьте, что полнотекстовый поиск учитывает описание '
+            'произведения.'
+        )
+        assert self.search(client, 'back" OR (') == []
+        assert self.search(client, '***') == []
+
+    def test_02_search_is_ranked(self, client):
+        Title.objects.create(
+            name='Ночной дозор', year=2004, description='Про дозор'
+        )
+        Title.objects.create(name='Дневной свет', year=2004,
+                             description='Почти ночной фильм')
+        assert self.search(client, 'ночной') == [
+            'Ночной дозор', 'Дневной свет'
+        ], (
+            'Проверьте, что совпадения в названии ранжируются выше '
+            'совпадений в описании.'
+        )
+
+    def test_03_search_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Робокоп'}
+        )
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'робокоп') == ['Робокоп']
+
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert self.search(client, 'робокоп') == []
+
+        call_command('rebuild_search_index', 'titles')
+        assert self.search(client, 'орешек') == [titles[1]['name']]
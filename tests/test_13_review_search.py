@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ReviewSearch:
+
+    REVIEWS_SEARCH_URL = '/api/v1/search/reviews/'
+    COMMENTS_SEARCH_URL = '/api/v1/search/comments/'
+
+    def test_01_search_permissions(self, client, user_client,
+                                   moderator_client):
+        for url in (self.REVIEWS_SEARCH_URL, self.COMMENTS_SEARCH_URL):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что поиск `{url}` недоступен пользователю с '
+                'ролью `user`.'
+            )
+            assert moderator_client.get(url).status_code == HTTPStatus.OK
+
+    def test_02_review_search(self, admin_client, admin, user, user_client,
+                              moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL, {'search': 'number 2'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [review['id'] for review in results] == [reviews[1]['id']], (
+            'Проверьте, что поиск по отзывам находит отзывы по тексту.'
+        )
+        assert results[0]['title'] == titles[0]['id']
+        assert results[0]['author'] == user.username
+
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL,
+            {'search': 'review', 'author': moderator.username}
+        )
+        assert [
+            review['id'] for review in response.json()['results']
+        ] == [reviews[2]['id']]
+
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL,
+            {'search': 'review', 'title': titles[1]['id']}
+        )
+        assert response.json()['results'] == []
+
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL,
+            {'search': 'review', 'until': '2000-01-01T00:00:00Z'}
+        )
+        assert response.json()['results'] == []
+
+    def test_03_comment_search(self, admin_client, admin, user, user_client,
+                               moderator, moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        response = moderator_client.get(
+            self.COMMENTS_SEARCH_URL,
+            {'search': 'comment', 'review': reviews[0]['id']}
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert {comment['id'] for comment in results} == {
+            comment['id'] for comment in comments
+        }
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            f'comments/{comments[0]["id"]}/'
+        )
+        response = moderator_client.get(
+            self.COMMENTS_SEARCH_URL, {'search': 'number 1'}
+        )
+        assert response.json()['results'] == [], (
+            'Проверьте, что удалённые комментарии исчезают из поиска.'
+        )
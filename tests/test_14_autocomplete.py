@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.indexes import TitleAutocompleteIndex
+from reviews.models import Title
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleAutocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/titles/autocomplete/'
+
+    def suggest(self, client, **params):
+        response = client.get(self.AUTOCOMPLETE_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.AUTOCOMPLETE_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_prefix_suggestions(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.suggest(client, q='терм') == [titles[0]['name']]
+        assert self.suggest(client, q='  КРЕПКИЙ  ор') == [titles[1]['name']]
+        assert self.suggest(client, q='орешек') == []
+        response = client.get(self.AUTOCOMPLETE_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_suggestions_follow_writes(self, client, admin_client,
+                                          user_client):
+        titles, _, _ = create_titles(admin_client)
+        for name in ('Крестный отец', 'Крестоносцы'):
+            admin_client.post('/api/v1/titles/', data={
+                'name': name, 'year': 1972, 'category': 'films'
+            })
+        assert self.suggest(client, q='крест') == [
+            'Крестный отец', 'Крестоносцы'
+        ]
+        crusaders = client.get(
+            '/api/v1/titles/', {'search': 'Крестоносцы'}
+        ).json()['results'][0]['id']
+        create_single_review(user_client, crusaders, 'Шедевр', 10)
+        assert self.suggest(client, q='крест', limit=1) == ['Крестоносцы'], (
+            'Проверьте, что подсказки упорядочены по рейтингу произведений.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Кремень'}
+        )
+        assert self.suggest(client, q='кре') == [
+            'Крестоносцы', 'Кремень', 'Крепкий орешек', 'Крестный отец'
+        ]
+        admin_client.delete(f'/api/v1/titles/{crusaders}/')
+        assert 'Крестоносцы' not in self.suggest(client, q='кре')
+
+    def test_03_other_workers_catch_up(self, client, admin_client,
+                                       user_client):
+        titles, _, _ = create_titles(admin_client)
+        other = TitleAutocompleteIndex()
+        other.refresh()
+        create_single_review(user_client, titles[1]['id'], 'Шедевр', 10)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Кремень'}
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        with CaptureQueriesContext(connection) as context:
+            assert other.suggest('кре', 5) == [{
+                'id': titles[0]['id'], 'name': 'Кремень', 'rating': None
+            }], (
+                'Проверьте, что изменения произведений попадают в подсказки '
+                'во всех процессах.'
+            )
+        table = Title._meta.db_table
+        assert all(
+            'updated_at' in query['sql']
+            for query in context.captured_queries if table in query['sql']
+        ), (
+            'Проверьте, что другие процессы догоняют индекс подсказок '
+            'по изменённым строкам, не перечитывая всю таблицу произведений.'
+        )
+
+    def test_04_rating_reaches_other_workers(self, client, admin_client,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        other = TitleAutocompleteIndex()
+        other.refresh()
+        create_single_review(user_client, titles[1]['id'], 'Шедевр', 10)
+        assert other.suggest('кр', 1) == [{
+            'id': titles[1]['id'], 'name': titles[1]['name'], 'rating': 10
+        }], (
+            'Проверьте, что изменение рейтинга обновляет подсказки '
+            'во всех процессах.'
+        )
@@ -0,0 +1,168 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Genre
+from tests.utils import (create_comments, create_reviews,
+                         create_single_review, create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def assert_not_modified(self, client, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с заголовком '
+            '`If-None-Match` возвращает 304, если данные не изменились.'
+        )
+        assert len(context.captured_queries) <= 1
+
+    def test_01_title_list_etag(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        etag = response['ETag']
+        assert etag.startswith('"')
+        self.assert_not_modified(client, self.TITLES_URL, etag)
+
+        response = client.get(
+            f'{self.TITLES_URL}?page=1', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение рейтинга меняет ETag списка '
+            'произведений.'
+        )
+        etag = response['ETag']
+
+        admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление произведения меняет ETag списка.'
+        )
+
+    def test_02_title_detail_validators(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assert_not_modified(client, url, etag)
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        genre = Genre.objects.get(slug=titles[0]['genre'][0])
+        genre.name = 'Хоррор'
+        genre.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение жанра меняет ETag произведения.'
+        )
+        assert {'name': 'Хоррор', 'slug': genre.slug} in response.json()[
+            'genre'
+        ]
+
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=0),
+            HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_comment_list_etag(self, client, admin_client, admin, user,
+                                  user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        user_client.patch(f'{url}{comments[1]["id"]}/', data={'text': 'Ну'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_list_probe_does_not_count(self, client, admin_client):
+        create_titles(admin_client)
+        for url in (
+            f'{self.TITLES_URL}?count=none', f'{self.TITLES_URL}?cursor='
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert not [
+                query for query in context.captured_queries
+                if 'COUNT(' in query['sql'] or 'MAX(' in query['sql']
+            ], (
+                'Проверьте, что проверка ETag списка не подсчитывает и не '
+                'просматривает все строки.'
+            )
+
+    def test_05_author_rename_changes_etags(self, client, admin_client,
+                                            admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        list_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        detail_url = f'{list_url}{reviews[1]["id"]}/'
+        etags = {url: client.get(url)['ETag'] for url in (
+            list_url, detail_url
+        )}
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что смена имени автора меняет ETag отзывов.'
+            )
+            assert 'renamed' in response.content.decode()
+
+    def test_06_malformed_ids_not_found(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        for url in (
+            f'{self.TITLES_URL}abc/',
+            f'{title_url}reviews/abc/',
+            f'{review_url}comments/abc/',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с некорректным '
+                'идентификатором возвращает 404.'
+            )
+
+    def test_07_orm_comment_delete_changes_etag(self, client, admin_client,
+                                                admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etag = client.get(url)['ETag']
+        Comment.objects.get(pk=comments[0]['id']).delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария в обход API меняет ETag '
+            'списка комментариев.'
+        )
+        assert response.json()['results'] == []
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.benchmarks import call_view
+from api.caching import response_cache
+from api.views import TitleViewSet
+from reviews.models import Category, Genre
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def assert_cached(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+            'обслуживается из кэша ответов.'
+        )
+        assert not context.captured_queries
+        return response
+
+    def test_01_anonymous_reads_are_cached(self, client, admin_client):
+        create_titles(admin_client)
+        for url in (self.TITLES_URL, self.GENRES_URL, self.CATEGORIES_URL):
+            response = client.get(url)
+            assert response['X-Cache'] == 'MISS'
+            assert self.assert_cached(client, url).json() == response.json()
+
+        hits = response_cache.hits.value
+        client.get(f'{self.TITLES_URL}?year=1&page=1')
+        client.get(f'{self.TITLES_URL}?page=1&year=1')
+        assert response_cache.hits.value == hits + 1, (
+            'Проверьте, что ключ кэша не зависит от порядка параметров '
+            'запроса.'
+        )
+
+        response = admin_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы с авторизацией не обслуживаются из '
+            'кэша ответов.'
+        )
+
+    def test_02_title_writes_invalidate(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        client.get(url)
+        client.get(self.TITLES_URL)
+        self.assert_cached(client, url)
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш ответа произведения.'
+        )
+        assert client.get(self.TITLES_URL)['X-Cache'] == 'MISS'
+
+        other_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        client.get(other_url)
+        admin_client.patch(url, data={'name': 'Новое название'})
+        self.assert_cached(client, other_url)
+        assert client.get(url).json()['name'] == 'Новое название'
+
+    def test_03_reference_writes_invalidate(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        for cached_url in (url, self.GENRES_URL, self.CATEGORIES_URL):
+            client.get(cached_url)
+
+        genre = Genre.objects.get(slug=titles[0]['genre'][0])
+        genre.name = 'Хоррор'
+        genre.save()
+        assert client.get(self.GENRES_URL)['X-Cache'] == 'MISS'
+        assert {'name': 'Хоррор', 'slug': genre.slug} in client.get(
+            url
+        ).json()['genre'], (
+            'Проверьте, что изменение жанра сбрасывает кэш ответов '
+            'произведений.'
+        )
+        self.assert_cached(client, self.CATEGORIES_URL)
+
+        Category.objects.all().delete()
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'] == []
+
+    def test_04_benchmark_bypasses_cache(self, admin_client):
+        create_titles(admin_client)
+        view = TitleViewSet.as_view({'get': 'list'}, cache_responses=False)
+        for _ in range(2):
+            response = call_view(view, self.TITLES_URL, {'count': 'none'})
+            assert response.status_code == HTTPStatus.OK
+            assert 'X-Cache' not in response, (
+                'Проверьте, что бенчмарк измеряет представление, а не кэш '
+                'ответов.'
+            )
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.caching import fragment_cache
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17FragmentCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_results(self, client, url):
+        hits, misses = fragment_cache.hits.value, fragment_cache.misses.value
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['results'], (
+            fragment_cache.hits.value - hits,
+            fragment_cache.misses.value - misses
+        )
+
+    def test_01_changed_objects_are_reserialized(self, admin_client, admin,
+                                                 user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+
+        results, _ = self.get_results(admin_client, url)
+        cached_results, counts = self.get_results(admin_client, url)
+        assert cached_results == results
+        assert counts == (len(reviews), 0), (
+            'Проверьте, что повторный запрос списка отзывов собирается из '
+            'закэшированных фрагментов.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        results, counts = self.get_results(admin_client, url)
+        assert counts == (len(reviews) - 1, 1), (
+            'Проверьте, что заново сериализуются только изменённые отзывы.'
+        )
+        assert {review['id']: review['score'] for review in results}[
+            reviews[1]['id']
+        ] == 9
+
+        title_results, _ = self.get_results(admin_client, self.TITLES_URL)
+        rating = {title['id']: title['rating'] for title in title_results}
+        assert rating[title_id] == 7, (
+            'Проверьте, что изменение оценки обновляет закэшированный '
+            'фрагмент произведения.'
+        )
+
+    def test_02_author_rename_refreshes_fragments(self, admin_client, admin,
+                                                  user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        self.get_results(admin_client, url)
+
+        user.username = 'renamed'
+        user.save()
+        results, counts = self.get_results(admin_client, url)
+        assert counts == (len(reviews) - 1, 1)
+        assert 'renamed' in {review['author'] for review in results}, (
+            'Проверьте, что смена имени автора обновляет фрагменты его '
+            'отзывов.'
+        )
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.indexes import reference_snapshot
+from reviews.models import Category, Genre
+from tests.utils import create_titles
+
+REFERENCE_TABLES = (Category._meta.db_table, Genre._meta.db_table)
+
+
+def reference_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if any(f'FROM "{table}"' in query['sql'] for table in REFERENCE_TABLES)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ReferenceSnapshot:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_titles_resolve_against_snapshot(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        reference_snapshot.refresh()
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug'],
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+            detail = admin_client.get(
+                self.TITLE_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+            title_list = admin_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['category'] == categories[0]
+        assert response.json()['genre'] == sorted(
+            (genres[0], genres[2]), key=lambda genre: genre['name']
+        )
+        assert detail.json()['genre'] == sorted(
+            genres[:2], key=lambda genre: genre['name']
+        )
+        assert title_list.json()['count'] == 3
+        assert not reference_queries(context), (
+            'Проверьте, что жанры и категории произведений берутся из '
+            'снимка справочников, а не из базы данных.'
+        )
+
+        data['genre'] = ['unknown']
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_snapshot_follows_writes(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        reference_snapshot.refresh()
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        genre.name = 'Хоррор'
+        genre.save()
+        admin_client.delete(f'{self.GENRES_URL}{genres[1]["slug"]}/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(self.GENRES_URL)
+            search = admin_client.get(f'{self.GENRES_URL}?search=хор')
+        assert not reference_queries(context), (
+            'Проверьте, что список жанров отдаётся из снимка справочников.'
+        )
+        assert response.json()['results'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Хоррор', 'slug': genre.slug},
+        ]
+        assert search.json()['results'] == [
+            {'name': 'Хоррор', 'slug': genre.slug}
+        ]
+        detail = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert detail.json()['genre'] == [
+            {'name': 'Хоррор', 'slug': genre.slug}
+        ]
@@ -0,0 +1,108 @@
+import multiprocessing
+import time
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from api.cache_backends import SharedMemoryCache
+
+
+def make_cache(path, max_entries=64, slot_size=256, ways=4):
+    return SharedMemoryCache(str(path), {
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': max_entries,
+            'SLOT_SIZE': slot_size,
+            'WAYS': ways,
+        },
+    })
+
+
+def increment_many(path, times):
+    cache = make_cache(path)
+    for _ in range(times):
+        cache.incr('counter')
+
+
+class Test19SharedMemoryCache:
+
+    def test_01_basic_operations(self, tmp_path):
+        cache = make_cache(tmp_path / 'cache')
+        cache.set('key', {'value': 1})
+        assert cache.get('key') == {'value': 1}
+        assert cache.add('key', 2) is False
+        assert cache.add('other', 2) is True
+        assert cache.incr('other', 3) == 5
+        with pytest.raises(ValueError):
+            cache.incr('missing')
+        assert cache.delete('key') is True
+        assert cache.get('key', 'default') == 'default'
+
+        cache.set('expiring', 1, timeout=0.05)
+        time.sleep(0.1)
+        assert cache.get('expiring') is None, (
+            'Проверьте, что записи с истёкшим сроком не возвращаются.'
+        )
+
+        cache.set('large', 'x' * 1024)
+        assert cache.get('large') is None, (
+            'Проверьте, что значения больше слота не сохраняются.'
+        )
+
+        other = make_cache(tmp_path / 'cache')
+        assert other.get('other') == 5, (
+            'Проверьте, что записи видны другим экземплярам, открывшим тот '
+            'же файл.'
+        )
+        other.clear()
+        assert cache.get('other') is None
+
+    def test_02_size_is_bounded(self, tmp_path):
+        cache = make_cache(tmp_path / 'cache', max_entries=16)
+        for index in range(200):
+            cache.set(f'key-{index}', index)
+        assert len(cache) <= 16, (
+            'Проверьте, что кэш вытесняет записи при заполнении.'
+        )
+        assert cache.get('key-199') == 199
+
+    def test_03_increments_are_atomic_across_processes(self, tmp_path):
+        path = tmp_path / 'cache'
+        cache = make_cache(path)
+        cache.set('counter', 0)
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=increment_many, args=(path, 200))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert cache.get('counter') == 800, (
+            'Проверьте, что `incr` атомарен между процессами.'
+        )
+
+    def test_04_foreign_files_are_refused(self, tmp_path):
+        target = tmp_path / 'target'
+        target.write_bytes(b'')
+        link = tmp_path / 'link'
+        link.symlink_to(target)
+        with pytest.raises(OSError):
+            make_cache(link).get('key')
+
+        exposed = tmp_path / 'exposed'
+        exposed.write_bytes(b'')
+        exposed.chmod(0o644)
+        with pytest.raises(ImproperlyConfigured):
+            make_cache(exposed).get('key')
+        assert exposed.read_bytes() == b'', (
+            'Проверьте, что файл кэша, доступный другим пользователям, не '
+            'используется.'
+        )
+
+    def test_05_tests_use_their_own_file(self, settings):
+        assert settings.CACHES['shared']['KEY_PREFIX'] == 'tests'
+        assert not settings.CACHES['shared']['LOCATION'].startswith(
+            settings.SHARED_CACHE_DIR
+        ), 'Проверьте, что тесты не используют кэш запущенного сервера.'
@@ -0,0 +1,89 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connections
+from django.test import Client
+from django.test.client import RequestFactory
+
+from api.caching import Flight, response_cache, single_flight
+from api.views import TitleViewSet
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SingleFlight:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_concurrent_misses_are_coalesced(self, admin_client,
+                                                monkeypatch):
+        create_titles(admin_client)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        original_list = TitleViewSet.list
+
+        def slow_list(self, request, *args, **kwargs):
+            calls.append(request)
+            started.set()
+            release.wait(5)
+            return original_list(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(TitleViewSet, 'list', slow_list)
+        responses = []
+
+        def fetch():
+            responses.append(Client().get(self.TITLES_URL))
+            connections.close_all()
+
+        leaders = single_flight.leaders.value
+        coalesced = single_flight.coalesced.value
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        threads[0].start()
+        assert started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1, (
+            'Проверьте, что одновременные промахи кэша по списку '
+            'произведений вычисляются одним запросом.'
+        )
+        assert {response.status_code for response in responses} == {
+            HTTPStatus.OK
+        }
+        assert len({response.content for response in responses}) == 1
+        assert sorted(response['X-Cache'] for response in responses) == [
+            'COALESCED', 'COALESCED', 'COALESCED', 'MISS'
+        ]
+        assert single_flight.leaders.value == leaders + 1
+        assert single_flight.coalesced.value == coalesced + 3
+
+    def test_02_waiters_get_stale_copy(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        stale = client.get(self.TITLES_URL)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Новое'}
+        )
+        key = response_cache.make_key(
+            RequestFactory().get(self.TITLES_URL)
+        )
+        single_flight.flights[key] = Flight()
+        try:
+            response = client.get(self.TITLES_URL)
+        finally:
+            del single_flight.flights[key]
+        assert response['X-Cache'] == 'STALE', (
+            'Проверьте, что пока ответ пересчитывается другим запросом, '
+            'остальные получают устаревшую копию.'
+        )
+        assert response.content == stale.content
+        response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert 'Новое' in {title['name'] for title in response.json()[
+            'results'
+        ]}
@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.indexes import LiveIdSet, live_ids
+from api.mixins import negative_lookups
+from reviews.models import Review, Title
+from reviews.signals import catalog_imported
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21NegativeLookups:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def assert_short_circuited(self, client, url):
+        for index in live_ids.values():
+            index.refresh()
+        short_circuits = negative_lookups.value
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not context.captured_queries, (
+            f'Проверьте, что GET-запрос к `{url}` с несуществующим '
+            'идентификатором возвращает 404 без запросов к базе данных.'
+        )
+        assert negative_lookups.value == short_circuits + 1
+
+    def test_01_unknown_ids(self, client, admin_client, admin, user_client,
+                           user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        missing_id = Title.objects.order_by('-id').first().id + 100
+
+        self.assert_short_circuited(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=missing_id)
+        )
+        self.assert_short_circuited(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id + 100
+            )
+        )
+        self.assert_short_circuited(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=missing_id, review_id=review_id
+            )
+        )
+        response = user_client.get(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        Review.objects.filter(pk=review_id).delete()
+        self.assert_short_circuited(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+
+    def test_02_live_ids_follow_writes(self, admin_client, user_client):
+        for index in live_ids.values():
+            index.refresh()
+        title = Title.objects.create(name='Новое', year=2000)
+        response = user_client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новые произведения сразу попадают в множество '
+            'существующих идентификаторов.'
+        )
+
+        Title.objects.bulk_create([Title(name='Импорт', year=2000)])
+        catalog_imported.send(sender=self.__class__)
+        imported = Title.objects.get(name='Импорт')
+        response = user_client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=imported.id)
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_other_workers_catch_up(self, admin_client, admin, user_client,
+                                       user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        other = LiveIdSet(Review)
+        other.refresh()
+        assert reviews[0]['id'] in other
+
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'Новый отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        added = response.json()['id']
+        Review.objects.filter(pk=reviews[0]['id']).delete()
+        with CaptureQueriesContext(connection) as context:
+            other.refresh()
+        assert added in other
+        assert reviews[0]['id'] not in other
+        table = Review._meta.db_table
+        assert all(
+            '"id" >' in query['sql'] for query in context.captured_queries
+            if table in query['sql']
+        ), (
+            'Проверьте, что другие процессы догоняют множество '
+            'идентификаторов по новым строкам и журналу удалений, '
+            'не перечитывая всю таблицу отзывов.'
+        )
+
+    def test_04_import_rebuilds_other_workers(self, admin_client):
+        Title.objects.bulk_create([
+            Title(id=5000, name='Позднее', year=2000)
+        ])
+        other = LiveIdSet(Title)
+        other.refresh()
+        Title.objects.bulk_create([Title(id=5, name='Импорт', year=2000)])
+        catalog_imported.send(sender=self.__class__)
+        assert 5 in other, (
+            'Проверьте, что после импорта каталога другие процессы '
+            'перестраивают множество идентификаторов целиком.'
+        )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.indexes import live_ids
+from reviews.models import Review, Title
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22NestedResources:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_are_scoped_to_title(self, client, admin_client,
+                                            admin, user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        other = create_single_review(
+            user_client, titles[1]['id'], 'Другой отзыв', 3
+        ).json()
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [review['id'] for review in response.json()['results']] == [
+            other['id']
+        ], (
+            'Проверьте, что список отзывов содержит только отзывы '
+            'запрошенного произведения.'
+        )
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+            + f'{reviews[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_chain_is_resolved_once(self, client, admin_client, admin,
+                                       user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        for index in live_ids.values():
+            index.refresh()
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and any(
+                f'FROM "{model._meta.db_table}"' in query['sql']
+                for model in (Review, Title)
+            )
+        ]
+        assert len(lookups) == 1, (
+            'Проверьте, что цепочка `title_id`/`review_id` проверяется '
+            'одним запросом при создании комментария.'
+        )
+
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв другого произведения не найден по '
+            'вложенному адресу.'
+        )
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.middleware import IDENTITY_MAP_HEADER
+from tests.utils import create_reviews, create_single_review
+from users.models import User
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{User._meta.db_table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23IdentityMap:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_user_is_loaded_once(self, settings, admin_client, admin,
+                                    user_client, user):
+        settings.DEBUG = True
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['author'] == user.username
+        assert len(user_queries(context)) <= 1, (
+            'Проверьте, что пользователь загружается из базы данных не '
+            'более одного раза за запрос.'
+        )
+        assert int(response[IDENTITY_MAP_HEADER]) >= 1, (
+            f'Проверьте, что заголовок `{IDENTITY_MAP_HEADER}` сообщает '
+            'число сэкономленных запросов.'
+        )
+
+        settings.DEBUG = False
+        response = user_client.get(url)
+        assert IDENTITY_MAP_HEADER not in response
+
+    def test_02_author_is_read_only(self, admin_client, admin, user_client,
+                                    user):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        response = user_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 5, 'author': admin.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username, (
+            'Проверьте, что автора отзыва нельзя подменить в запросе.'
+        )
+        response = create_single_review(
+            admin_client, titles[1]['id'], 'Отзыв', 4
+        )
+        assert response.json()['author'] == admin.username
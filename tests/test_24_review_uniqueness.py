@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+DUPLICATE_REVIEW_ERRORS = {
+    'non_field_errors': ['You can leave only one review for a title!']
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReviewUniqueness:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_review_is_rejected(self, admin_client,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(
+                f'{url}{review["id"]}/', data={'score': 6}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT (1) AS "a"')
+        ], (
+            'Проверьте, что при изменении отзыва не выполняется проверка '
+            'существования дубликата.'
+        )
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == DUPLICATE_REVIEW_ERRORS
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.review_count, title.rating) == (1, 6), (
+            'Проверьте, что отклонённый дубликат не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_02_lost_race_is_rejected(self, admin_client, user,
+                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        Review.objects.create(
+            author=user, title_id=titles[0]['id'], text='Отзыв', score=3
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                url, data={'text': 'Отзыв', 'score': 9}
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отзыв, проигравший гонку за уникальность, '
+            'отклоняется с кодом 400.'
+        )
+        assert response.json() == DUPLICATE_REVIEW_ERRORS
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_review"')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что дубликат отклоняется ограничением уникальности, '
+            'а не предварительной проверкой.'
+        )
+        assert Review.objects.filter(title_id=titles[0]['id']).count() == 1
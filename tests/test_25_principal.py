@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from api.permissions import IsStaffOrAuthorOrReadOnly, get_principal
+from reviews.models import Review
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Principal:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def make_request(self, user):
+        request = APIRequestFactory().patch('/')
+        force_authenticate(request, user=user)
+        return APIView().initialize_request(request)
+
+    def test_01_object_permission_is_query_free(self, admin_client, admin,
+                                                user_client, user,
+                                                moderator):
+        reviews, _ = create_reviews(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        permission = IsStaffOrAuthorOrReadOnly()
+        expected = {user: (False, True), moderator: (True, True)}
+        for principal_user, results in expected.items():
+            request = self.make_request(principal_user)
+            for review, result in zip(reviews, results):
+                review = Review.objects.get(pk=review['id'])
+                with CaptureQueriesContext(connection) as context:
+                    allowed = permission.has_object_permission(
+                        request, None, review
+                    )
+                assert allowed is result, (
+                    'Проверьте, что права на изменение отзыва есть только у '
+                    'автора и персонала.'
+                )
+                assert not context.captured_queries, (
+                    'Проверьте, что проверка прав не обращается к базе '
+                    'данных.'
+                )
+        request = self.make_request(user)
+        assert get_principal(request) is get_principal(request), (
+            'Проверьте, что принципал вычисляется один раз за запрос.'
+        )
+
+    def test_02_foreign_review_is_forbidden(self, admin_client, admin,
+                                            user_client, user,
+                                            moderator_client):
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = user_client.patch(url, data={'text': 'Чужой'})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = moderator_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
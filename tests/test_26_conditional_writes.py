@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+from tests.utils import create_comments, create_reviews
+
+
+def write_queries(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith(('UPDATE', 'DELETE'))
+        and f'"{table}"' in query['sql'].split('WHERE')[0]
+    ]
+
+
+def select_queries(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ConditionalWrites:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    def test_01_comment_delete_is_one_statement(self, admin_client, admin,
+                                                user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id'],
+            comment_id=comments[1]['id']
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert len(write_queries(context, Comment._meta.db_table)) == 1
+        assert len(select_queries(context, Comment._meta.db_table)) <= 1, (
+            'Проверьте, что комментарий удаляется одним условным запросом '
+            'без предварительной выборки объекта.'
+        )
+        assert not select_queries(context, Review._meta.db_table)
+        assert not Comment.objects.filter(pk=comments[1]['id']).exists()
+
+    def test_02_rows_affected_decide_status(self, admin_client, admin,
+                                            user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        comment_url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id'],
+            comment_id=comments[0]['id']
+        )
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        for url in (comment_url, review_url):
+            response = user_client.delete(url)
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что попытка удалить чужой объект возвращает 403.'
+            )
+            response = user_client.patch(url, data={'text': 'Чужой'})
+            assert response.status_code == HTTPStatus.FORBIDDEN
+        assert Comment.objects.get(pk=comments[0]['id']).text == (
+            comments[0]['text']
+        )
+        assert Review.objects.filter(pk=reviews[0]['id']).exists()
+
+        missing_urls = (
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id'],
+                comment_id=comments[-1]['id'] + 100
+            ),
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        for url in missing_urls:
+            response = admin_client.delete(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что удаление несуществующего объекта возвращает '
+                '404.'
+            )
+
+    def test_03_patch_writes_changed_columns(self, admin_client, admin,
+                                             user_client, user,
+                                             moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['text'] == 'Новый текст'
+        updates = write_queries(context, Review._meta.db_table)
+        assert len(updates) == 1 and '"score"' not in updates[0], (
+            'Проверьте, что при частичном обновлении записываются только '
+            'изменённые поля.'
+        )
+        assert not write_queries(context, Title._meta.db_table)
+
+        response = moderator_client.patch(url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['author'] == user.username
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (
+            14, 2, 7
+        ), (
+            'Проверьте, что изменение оценки пересчитывает рейтинг в той же '
+            'транзакции.'
+        )
+
+        response = moderator_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            5, 1, 5
+        )
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import PRINCIPAL_VERSION_CLAIM
+from tests.utils import create_reviews
+from users.models import User
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{User._meta.db_table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27CachedPrincipal:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def obtain_token(self, client, user):
+        user.confirmation_code = '12345'
+        user.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': '12345'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['token']
+
+    def obtain_client(self, client, user):
+        token_client = APIClient()
+        token_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.obtain_token(client, user)}'
+        )
+        return token_client
+
+    def test_01_principal_is_cached(self, admin_client, user_client):
+        for expected in (1, 0):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.get('/api/v1/users/me/')
+            assert response.status_code == HTTPStatus.OK
+            assert len(user_queries(context)) == 1 + expected, (
+                'Проверьте, что аутентификация берёт пользователя из кеша '
+                'принципалов.'
+            )
+
+    def test_02_role_claims_skip_user_lookup(self, settings, client,
+                                             admin_client, admin, user):
+        token_client = self.obtain_client(client, user)
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client, user: token_client
+        })
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = token_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['author'] == user.username
+        assert not user_queries(context), (
+            'Проверьте, что роль из токена избавляет от запроса '
+            'пользователя.'
+        )
+
+        settings.PRINCIPAL_TOKEN_CLAIMS = False
+        token = AccessToken(self.obtain_token(client, user))
+        assert PRINCIPAL_VERSION_CLAIM not in token, (
+            'Проверьте, что роль встраивается в токен только при включённой '
+            'настройке `PRINCIPAL_TOKEN_CLAIMS`.'
+        )
+
+    def test_03_role_changes_are_honored(self, client, admin_client, admin,
+                                         user, moderator):
+        token_client = self.obtain_client(client, moderator)
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client, user: token_client
+        })
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = token_client.patch(url, data={'text': 'Модерация'})
+        assert response.status_code == HTTPStatus.OK
+
+        response = admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = token_client.patch(url, data={'text': 'Снова'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что смена роли сразу отзывает закешированный '
+            'принципал.'
+        )
+
+        moderator.refresh_from_db()
+        moderator.is_active = False
+        moderator.save()
+        response = token_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что заблокированный пользователь не проходит '
+            'аутентификацию.'
+        )
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import VerifiedTokenCache, verified_tokens
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28VerifiedTokens:
+
+    def test_01_reused_token_is_verified_once(self, user, token_user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+        )
+        with mock.patch.object(
+            AccessToken, 'verify', autospec=True,
+            side_effect=AccessToken.verify
+        ) as verify:
+            for _ in range(3):
+                response = client.get('/api/v1/users/me/')
+                assert response.status_code == HTTPStatus.OK
+        assert verify.call_count == 1, (
+            'Проверьте, что подпись повторно используемого токена '
+            'проверяется один раз.'
+        )
+
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {token_user["access"][:-2]}xx'
+        )
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменённый токен не принимается из кеша.'
+        )
+
+    def test_02_cache_is_bounded_and_expiring(self, user):
+        cache = VerifiedTokenCache(2)
+        tokens = [AccessToken.for_user(user) for _ in range(3)]
+        raw_tokens = [str(token).encode() for token in tokens]
+        cache.set(raw_tokens[0], tokens[0])
+        cache.set(raw_tokens[1], tokens[1])
+        assert cache.get(raw_tokens[0]) is tokens[0]
+        cache.set(raw_tokens[2], tokens[2])
+        assert len(cache) == 2
+        assert cache.get(raw_tokens[1]) is None, (
+            'Проверьте, что при переполнении вытесняется давно не '
+            'использованный токен.'
+        )
+        assert cache.get(raw_tokens[0]) is tokens[0]
+
+        tokens[2].set_exp(lifetime=timedelta(seconds=-1))
+        cache.set(raw_tokens[2], tokens[2])
+        assert cache.get(raw_tokens[2]) is None, (
+            'Проверьте, что истёкший токен не возвращается из кеша.'
+        )
+        assert len(cache) == 1
+        assert len(verified_tokens) <= verified_tokens.max_size
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.indexes import RevokedTokenFilter, revoked_tokens
+from users.models import RevokedToken
+
+TOKEN_REVOKE_URL = '/api/v1/auth/token/revoke/'
+
+
+def revocation_queries(context):
+    return [
+        query for query in context.captured_queries
+        if f'"{RevokedToken._meta.db_table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TokenRevocation:
+
+    def test_01_revoked_token_is_rejected(self, user_client, token_user,
+                                          admin_client):
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert not revocation_queries(context), (
+            'Проверьте, что неотозванный токен проверяется без обращения к '
+            'базе данных.'
+        )
+
+        response = user_client.post(TOKEN_REVOKE_URL)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert RevokedToken.objects.count() == 1
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что отозванный токен больше не принимается.'
+        )
+        response = admin_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+        )
+        revoked_tokens.invalidate()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что фильтр отозванных токенов восстанавливается '
+            'из базы данных.'
+        )
+
+    def test_02_filter_catches_up_incrementally(self, user):
+        index = RevokedTokenFilter(size=1 << 12, hashes=3)
+        assert 'first' not in index
+        RevokedToken.objects.create(
+            jti='first', user=user, expires_at=user.date_joined
+        )
+        assert 'first' in index, (
+            'Проверьте, что фильтр подгружает новые отзывы из базы данных.'
+        )
+        RevokedToken.objects.create(
+            jti='second', user=user, expires_at=user.date_joined
+        )
+        with CaptureQueriesContext(connection) as context:
+            assert 'second' in index
+        assert len(revocation_queries(context)) == 1
+        assert 'third' not in index
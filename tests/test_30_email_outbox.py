@@ -0,0 +1,90 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.constants import OUTBOX_RETRY_DELAY
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def sign_up(self, client, count):
+        for index in range(count):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': f'user{index}@yamdb.fake',
+                'username': f'user{index}'
+            })
+            assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_only_queues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        self.sign_up(client, 1)
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что регистрация не отправляет письмо в запросе.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'user0@yamdb.fake'
+        assert email.sent_at is None
+
+    def test_02_worker_drains_in_batches(self, client):
+        self.sign_up(client, 5)
+        mail.outbox = []
+        with mock.patch.object(
+            EmailBackend, 'open', autospec=True,
+            side_effect=EmailBackend.open
+        ) as open_connection:
+            call_command(
+                'send_outbox', '--once', '--batch-size', '2',
+                stdout=StringIO()
+            )
+        assert open_connection.call_count == 1, (
+            'Проверьте, что все письма отправляются через одно соединение.'
+        )
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{index}@yamdb.fake' for index in range(5)
+        ]
+        assert not OutgoingEmail.objects.filter(sent_at=None).exists()
+
+        with mock.patch.object(
+            EmailBackend, 'open', autospec=True,
+            side_effect=EmailBackend.open
+        ) as open_connection:
+            call_command('send_outbox', '--once', stdout=StringIO())
+        assert len(mail.outbox) == 5, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+        assert not open_connection.called, (
+            'Проверьте, что при пустой очереди соединение с почтовым '
+            'сервером не открывается.'
+        )
+
+    def test_03_failures_are_retried_with_backoff(self, client):
+        self.sign_up(client, 2)
+        mail.outbox = []
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=OSError('SMTP down')
+        ):
+            call_command('send_outbox', '--once', stdout=StringIO())
+        email = OutgoingEmail.objects.order_by('pk').first()
+        assert (email.attempts, email.last_error) == (1, 'SMTP down')
+        assert email.next_attempt_at >= timezone.now() + (
+            timedelta(seconds=OUTBOX_RETRY_DELAY - 5)
+        ), 'Проверьте, что неудачная отправка откладывается.'
+
+        call_command('send_outbox', '--once', stdout=StringIO())
+        assert not mail.outbox, (
+            'Проверьте, что письмо не отправляется раньше срока повтора.'
+        )
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_outbox', '--once', stdout=StringIO())
+        assert len(mail.outbox) == 2